@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tortoise import Tortoise, transactions
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from minecraft_server_bot.models import BotMessage  # noqa: E402
+from settings import get_connection, get_tortoise_config  # noqa: E402
+
+MESSAGE_TYPE = "benchmark"
+
+
+async def persist(rows: int) -> float:
+    start = time.perf_counter()
+    for index in range(rows):
+        async with transactions.in_transaction():
+            await BotMessage.filter(guild_id=index, message_type=MESSAGE_TYPE).delete()
+            await BotMessage.create(
+                guild_id=index,
+                channel_id=index,
+                message_id=index,
+                message_type=MESSAGE_TYPE,
+            )
+    return time.perf_counter() - start
+
+
+async def load_all(repeat: int) -> tuple[float, int]:
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(await BotMessage.filter(message_type=MESSAGE_TYPE))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+async def load_each(rows: int) -> float:
+    start = time.perf_counter()
+    for index in range(rows):
+        await BotMessage.filter(guild_id=index, message_type=MESSAGE_TYPE).first()
+    return time.perf_counter() - start
+
+
+async def benchmark(name: str, connection: dict, rows: int, repeat: int) -> None:
+    await Tortoise.init(config=get_tortoise_config(connection))
+    try:
+        await Tortoise.generate_schemas(safe=True)
+        await BotMessage.filter(message_type=MESSAGE_TYPE).delete()
+        write = await persist(rows)
+        load, count = await load_all(repeat)
+        lookup = await load_each(rows)
+        await BotMessage.filter(message_type=MESSAGE_TYPE).delete()
+    except OSError as e:
+        print(f"{name:>10}: skipped, could not connect ({e})")
+        return
+    finally:
+        await Tortoise.close_connections()
+    print(
+        f"{name:>10}: "
+        f"write {write / rows * 1000:6.2f} ms/row, "
+        f"load {count} rows {load * 1000:7.2f} ms, "
+        f"lookup {lookup / rows * 1000:6.2f} ms/row"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite = get_connection(
+            "sqlite",
+            database_path=Path(directory).joinpath("benchmark.sqlite3"),
+        )
+        await benchmark("sqlite", sqlite, args.rows, args.repeat)
+    if args.postgres_database:
+        postgres = get_connection(
+            "postgres",
+            database_name=args.postgres_database,
+            pool_min_size=args.pool_min_size,
+            pool_max_size=args.pool_max_size,
+            statement_cache_size=args.statement_cache_size,
+        )
+        await benchmark("postgres", postgres, args.rows, args.repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares loading and persisting bot messages on each backend"
+    )
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--postgres-database",
+        help="An existing Postgres database to benchmark, skipped if not given",
+    )
+    parser.add_argument("--pool-min-size", type=int, default=1)
+    parser.add_argument("--pool-max-size", type=int, default=5)
+    parser.add_argument("--statement-cache-size", type=int, default=100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
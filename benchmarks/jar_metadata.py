@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import itertools
+import json
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import toml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from minecraft_server_bot.mods import Mod  # noqa: E402
+
+
+def zipfile_mods(path: Path) -> list[tuple[str, str]]:
+    with zipfile.ZipFile(path) as file:
+        members = file.namelist()
+        if "fabric.mod.json" in members:
+            data = json.load(file.open("fabric.mod.json"))
+            return [(data["name"], data["version"])]
+        elif "META-INF/mods.toml" in members:
+            data = toml.loads(file.open("META-INF/mods.toml").read().decode())
+            return [(mod["displayName"], mod["version"]) for mod in data["mods"]]
+    return []
+
+
+def build_jar(index: int, loader: str, class_count: int, nested: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as jar:
+        jar.writestr("META-INF/MANIFEST.MF", "Implementation-Version: 1.0.0\n")
+        for class_index in range(class_count):
+            jar.writestr(
+                f"com/example/mod{index}/Class{class_index}.class",
+                random.randbytes(random.randint(200, 2000)),
+            )
+        name = f"Mod {index}"
+        if loader == "fabric":
+            metadata = {"id": f"mod{index}", "name": name, "version": "1.0.0"}
+            jar.writestr("fabric.mod.json", json.dumps(metadata))
+            for nested_index in range(nested):
+                jar.writestr(
+                    f"META-INF/jars/module{nested_index}.jar",
+                    build_jar(index * 1000 + nested_index, "fabric", 10, 0),
+                    compress_type=zipfile.ZIP_STORED,
+                )
+        else:
+            metadata = {"mods": [{"modId": f"mod{index}", "displayName": name}]}
+            metadata["mods"][0]["version"] = "${file.jarVersion}"
+            path = {
+                "forge": "META-INF/mods.toml",
+                "neoforge": "META-INF/neoforge.mods.toml",
+            }[loader]
+            jar.writestr(path, toml.dumps(metadata))
+    return buffer.getvalue()
+
+
+def generate_modpack(path: Path, *, mod_count: int, class_count: int) -> list[Path]:
+    loaders = itertools.cycle(["fabric", "forge", "neoforge"])
+    paths = []
+    for index, loader in zip(range(mod_count), loaders):
+        jar_path = path.joinpath(f"mod{index}.jar")
+        nested = 4 if index % 10 == 0 else 0
+        jar_path.write_bytes(build_jar(index, loader, class_count, nested))
+        paths.append(jar_path)
+    return paths
+
+
+def benchmark(function, paths: list[Path], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(len(function(path)) for path in paths)
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares reading mod metadata with zipfile and JarReader"
+    )
+    parser.add_argument("--mods", type=int, default=300)
+    parser.add_argument("--classes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Generating {args.mods} jars with {args.classes} classes each...")
+        paths = generate_modpack(
+            Path(directory), mod_count=args.mods, class_count=args.classes
+        )
+        for name, function in [("zipfile", zipfile_mods), ("JarReader", Mod.from_jar)]:
+            seconds, count = benchmark(function, paths, args.repeat)
+            print(f"{name:>10}: {seconds * 1000:8.1f} ms, {count} mods found")
+
+
+if __name__ == "__main__":
+    main()
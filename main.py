@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 
 import os
+import re
 from pathlib import Path
 
 import dotenv
 
 from minecraft_server_bot import BotApplication
+from minecraft_server_bot.streaming import LOG_LEVELS
 from settings import TORTOISE_ORM
 
 dotenv.load_dotenv()
@@ -32,12 +34,71 @@ def main():
 
     session_name = os.environ.get("SESSION_NAME")
     max_wait_for_online = int(os.environ.get("MAX_WAIT_FOR_ONLINE", 30))
+
+    backup_path = os.environ.get("BACKUP_PATH")
+    if not backup_path:
+        backup_path = server_path.joinpath("backups")
+    backup_path = Path(backup_path).expanduser().resolve()
+    backup_retention = int(os.environ.get("BACKUP_RETENTION", 7))
+
+    console_channel_id = os.environ.get("CONSOLE_CHANNEL_ID")
+    console_channel_id = int(console_channel_id) if console_channel_id else None
+    console_interval = int(os.environ.get("CONSOLE_INTERVAL_MS", 1000)) / 1000
+    console_level = (os.environ.get("CONSOLE_LEVEL") or "INFO").upper()
+    if console_level not in LOG_LEVELS:
+        raise Exception(
+            f"Unknown console log level: '{console_level}', "
+            f"must be one of {', '.join(LOG_LEVELS)}"
+        )
+    console_filter = os.environ.get("CONSOLE_FILTER") or None
+    if console_filter is not None:
+        try:
+            re.compile(console_filter)
+        except re.error as e:
+            raise Exception(f"Invalid console filter '{console_filter}': {e}") from None
+
+    chat_channel_id = os.environ.get("CHAT_CHANNEL_ID")
+    chat_channel_id = int(chat_channel_id) if chat_channel_id else None
+
+    control_socket_path = os.environ.get("CONTROL_SOCKET_PATH")
+    if control_socket_path:
+        control_socket_path = Path(control_socket_path).expanduser().resolve()
+    else:
+        control_socket_path = None
+
+    profiler_enabled = os.environ.get("PROFILER_ENABLED", "").lower() in ["1", "true"]
+    profiler_threshold = int(os.environ.get("PROFILER_THRESHOLD_MS", 100)) / 1000
+    profiler_dump_path = os.environ.get("PROFILER_DUMP_PATH") or "perf.json"
+    profiler_dump_path = Path(profiler_dump_path).expanduser().resolve()
+
+    sharded = os.environ.get("SHARDED", "").lower() in ["1", "true"]
+    fanout_concurrency = int(os.environ.get("FANOUT_CONCURRENCY", 4))
+    priority_guild_ids = [
+        int(guild_id)
+        for guild_id in os.environ.get("PRIORITY_GUILD_IDS", "").split(",")
+        if guild_id.strip()
+    ]
+
     app = BotApplication(
         server_path=server_path,
         executable_filename=executable_filename,
         session_name=session_name,
         database_config=TORTOISE_ORM,
         max_wait_for_online=max_wait_for_online,
+        backup_path=backup_path,
+        backup_retention=backup_retention,
+        console_channel_id=console_channel_id,
+        console_interval=console_interval,
+        console_level=console_level,
+        console_filter=console_filter,
+        chat_channel_id=chat_channel_id,
+        control_socket_path=control_socket_path,
+        profiler_enabled=profiler_enabled,
+        profiler_threshold=profiler_threshold,
+        profiler_dump_path=profiler_dump_path,
+        sharded=sharded,
+        fanout_concurrency=fanout_concurrency,
+        priority_guild_ids=priority_guild_ids,
     )
     app.run(token)
 
@@ -2,6 +2,15 @@ from tortoise import BaseDBAsyncClient
 
 
 async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        CREATE TABLE IF NOT EXISTS "bot_messages" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "guild_id" BIGINT NOT NULL UNIQUE,
+    "channel_id" BIGINT NOT NULL UNIQUE,
+    "message_id" BIGINT NOT NULL UNIQUE,
+    "message_type" VARCHAR(255) NOT NULL
+);"""
     return """
         CREATE TABLE IF NOT EXISTS "bot_messages" (
     "id" SERIAL NOT NULL PRIMARY KEY,
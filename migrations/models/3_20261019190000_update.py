@@ -0,0 +1,62 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        CREATE TABLE IF NOT EXISTS "player_sessions" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "player_name" VARCHAR(32) NOT NULL,
+    "joined_at" TIMESTAMP NOT NULL,
+    "left_at" TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS "idx_player_sess_player__fa6203"
+    ON "player_sessions" ("player_name");
+CREATE INDEX IF NOT EXISTS "idx_player_sess_joined__5cf58f"
+    ON "player_sessions" ("joined_at");
+        CREATE TABLE IF NOT EXISTS "daily_playtime" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "day" DATE NOT NULL,
+    "player_name" VARCHAR(32) NOT NULL,
+    "seconds" INT NOT NULL  DEFAULT 0,
+    CONSTRAINT "uid_daily_playt_day_48449c" UNIQUE ("day", "player_name")
+);
+CREATE INDEX IF NOT EXISTS "idx_daily_playt_player__51769e"
+    ON "daily_playtime" ("player_name");
+        CREATE TABLE IF NOT EXISTS "daily_peaks" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "day" DATE NOT NULL UNIQUE,
+    "peak" INT NOT NULL  DEFAULT 0
+);"""
+    return """
+        CREATE TABLE IF NOT EXISTS "player_sessions" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "player_name" VARCHAR(32) NOT NULL,
+    "joined_at" TIMESTAMPTZ NOT NULL,
+    "left_at" TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS "idx_player_sess_player__fa6203"
+    ON "player_sessions" ("player_name");
+CREATE INDEX IF NOT EXISTS "idx_player_sess_joined__5cf58f"
+    ON "player_sessions" ("joined_at");
+        CREATE TABLE IF NOT EXISTS "daily_playtime" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "day" DATE NOT NULL,
+    "player_name" VARCHAR(32) NOT NULL,
+    "seconds" INT NOT NULL  DEFAULT 0,
+    CONSTRAINT "uid_daily_playt_day_48449c" UNIQUE ("day", "player_name")
+);
+CREATE INDEX IF NOT EXISTS "idx_daily_playt_player__51769e"
+    ON "daily_playtime" ("player_name");
+        CREATE TABLE IF NOT EXISTS "daily_peaks" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "day" DATE NOT NULL UNIQUE,
+    "peak" INT NOT NULL  DEFAULT 0
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "player_sessions";
+        DROP TABLE IF EXISTS "daily_playtime";
+        DROP TABLE IF EXISTS "daily_peaks";"""
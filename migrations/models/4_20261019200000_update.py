@@ -0,0 +1,36 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        CREATE TABLE IF NOT EXISTS "server_starts" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "started_at" TIMESTAMP NOT NULL,
+    "online_seconds" REAL,
+    "done_seconds" REAL,
+    "reported_seconds" REAL,
+    "mods_fingerprint" VARCHAR(64) NOT NULL,
+    "mod_count" INT NOT NULL  DEFAULT 0,
+    "world_size" BIGINT NOT NULL  DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS "idx_server_star_started_31763e"
+    ON "server_starts" ("started_at");"""
+    return """
+        CREATE TABLE IF NOT EXISTS "server_starts" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "started_at" TIMESTAMPTZ NOT NULL,
+    "online_seconds" DOUBLE PRECISION,
+    "done_seconds" DOUBLE PRECISION,
+    "reported_seconds" DOUBLE PRECISION,
+    "mods_fingerprint" VARCHAR(64) NOT NULL,
+    "mod_count" INT NOT NULL  DEFAULT 0,
+    "world_size" BIGINT NOT NULL  DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS "idx_server_star_started_31763e"
+    ON "server_starts" ("started_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "server_starts";"""
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .controller import ServerController
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUEST_SIZE = 64 * 1024
+MAX_PENDING_EVENTS = 16
+
+
+class ControlConnection:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.events: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self._write_lock: asyncio.Lock = asyncio.Lock()
+        self._event_task: asyncio.Task | None = None
+
+    @property
+    def subscribed(self) -> bool:
+        return self._event_task is not None
+
+    def subscribe(self) -> None:
+        if self._event_task is None:
+            self._event_task = asyncio.create_task(self._send_events())
+
+    def push_event(self, event: dict) -> None:
+        if self.events.full():
+            self.events.get_nowait()
+        self.events.put_nowait(event)
+
+    async def send(self, message: dict) -> None:
+        async with self._write_lock:
+            self.writer.write(json.dumps(message).encode() + b"\n")
+            await self.writer.drain()
+
+    async def close(self) -> None:
+        if self._event_task is not None:
+            self._event_task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _send_events(self) -> None:
+        while True:
+            event = await self.events.get()
+            try:
+                await self.send(event)
+            except ConnectionError:
+                return
+
+
+class ControlServer:
+    def __init__(self, *, controller: "ServerController", path: Path):
+        self.controller = controller
+        self.path = path
+        self._connections: set[ControlConnection] = set()
+        self._server: asyncio.AbstractServer | None = None
+        self._actions = {
+            "start": self._start,
+            "stop": self._stop,
+            "restart": self._restart,
+            "state": self._state,
+            "players": self._players,
+            "metrics": self._metrics,
+        }
+
+    @classmethod
+    async def create(
+        cls,
+        *,
+        controller: "ServerController",
+        path: Path,
+    ) -> "ControlServer":
+        self = cls(controller=controller, path=path)
+        if self.path.is_socket():
+            self.path.unlink()
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection,
+            path=str(self.path),
+            limit=MAX_REQUEST_SIZE,
+        )
+        os.chmod(self.path, 0o660)
+        controller.server_manager.add_listener(self.server_listener)
+        controller.server_info.add_listener(self.server_listener)
+        return self
+
+    async def server_listener(self, _) -> None:
+        event = {"event": "state", "result": self.controller.snapshot()}
+        for connection in self._connections:
+            if connection.subscribed:
+                connection.push_event(event)
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        connection = ControlConnection(writer)
+        self._connections.add(connection)
+        try:
+            while line := await reader.readline():
+                await connection.send(await self._handle_request(connection, line))
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            await connection.close()
+
+    async def _handle_request(self, connection: ControlConnection, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+            action = request["action"]
+        except (ValueError, TypeError, KeyError):
+            return {"ok": False, "error": "Invalid request"}
+        response = {"id": request.get("id")} if "id" in request else {}
+        if not isinstance(action, str):
+            return {**response, "ok": False, "error": "Invalid action"}
+
+        if action == "subscribe":
+            connection.subscribe()
+            connection.push_event(
+                {"event": "state", "result": self.controller.snapshot()}
+            )
+            return {**response, "ok": True, "result": None}
+        if action not in self._actions:
+            return {**response, "ok": False, "error": f"Unknown action: '{action}'"}
+        try:
+            result = await self._actions[action]()
+        except Exception as e:
+            logger.exception("Control API action '%s' failed", action)
+            return {**response, "ok": False, "error": str(e)}
+        return {**response, "ok": True, "result": result}
+
+    async def _start(self) -> dict:
+        await self.controller.handle_start()
+        return self.controller.snapshot()
+
+    async def _stop(self) -> dict:
+        await self.controller.handle_stop()
+        return self.controller.snapshot()
+
+    async def _restart(self) -> dict:
+        await self.controller.handle_restart()
+        return self.controller.snapshot()
+
+    async def _state(self) -> dict:
+        return self.controller.snapshot()
+
+    async def _players(self) -> list[str]:
+        return self.controller.server_info.players
+
+    async def _metrics(self) -> dict:
+        return self.controller.metrics()
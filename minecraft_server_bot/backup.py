@@ -0,0 +1,289 @@
+import asyncio
+import datetime as dt
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .server import ServerConfiguration, ServerConsole, ServerLog
+
+CHUNK_SIZE = 1024 * 1024
+SNAPSHOT_NAME_FORMAT = "%Y%m%d-%H%M%S-%f"
+MANIFEST_FILENAME = "manifest.json"
+IGNORED_FILENAMES = {"session.lock"}
+
+
+class BackupError(Exception):
+    pass
+
+
+class Backup:
+    def __init__(
+        self,
+        *,
+        name: str,
+        path: Path,
+        created: dt.datetime,
+        file_count: int,
+        total_bytes: int,
+        stored_bytes: int,
+        duration: float,
+    ):
+        self.name = name
+        self.path = path
+        self.created = created
+        self.file_count = file_count
+        self.total_bytes = total_bytes
+        self.stored_bytes = stored_bytes
+        self.duration = duration
+
+    @property
+    def throughput(self) -> float:
+        if not self.duration:
+            return 0.0
+        return self.total_bytes / self.duration
+
+    @property
+    def dedup_ratio(self) -> float:
+        if not self.stored_bytes:
+            return float("inf") if self.total_bytes else 1.0
+        return self.total_bytes / self.stored_bytes
+
+    @classmethod
+    def from_manifest(cls, path: Path) -> "Backup":
+        with open(path.joinpath(MANIFEST_FILENAME)) as file:
+            manifest = json.load(file)
+        stats = manifest["stats"]
+        return cls(
+            name=path.name,
+            path=path,
+            created=dt.datetime.fromisoformat(manifest["created"]),
+            file_count=len(manifest["files"]),
+            total_bytes=stats["total_bytes"],
+            stored_bytes=stats["stored_bytes"],
+            duration=stats["duration"],
+        )
+
+
+class BackupStore:
+    def __init__(self, *, path: Path, workers: int | None = None):
+        self.path = path
+        self.objects_path = path.joinpath("objects")
+        self.snapshots_path = path.joinpath("snapshots")
+        self.workers = workers
+
+    def list_snapshots(self) -> list[Path]:
+        if not self.snapshots_path.is_dir():
+            return []
+        return sorted(
+            path
+            for path in self.snapshots_path.iterdir()
+            if path.joinpath(MANIFEST_FILENAME).is_file()
+        )
+
+    def snapshot(self, *, server_path: Path, world_paths: list[Path]) -> Backup:
+        start = time.perf_counter()
+        created = dt.datetime.now()
+        name = created.strftime(SNAPSHOT_NAME_FORMAT)
+        snapshot_path = self.snapshots_path.joinpath(name)
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        snapshot_path.mkdir(parents=True)
+        try:
+            return self._write_snapshot(
+                snapshot_path,
+                created=created,
+                start=start,
+                server_path=server_path,
+                world_paths=world_paths,
+            )
+        except BaseException:
+            # Links in a snapshot without a manifest would stop its objects from
+            # ever being pruned
+            shutil.rmtree(snapshot_path, ignore_errors=True)
+            raise
+
+    def _write_snapshot(
+        self,
+        snapshot_path: Path,
+        *,
+        created: dt.datetime,
+        start: float,
+        server_path: Path,
+        world_paths: list[Path],
+    ) -> Backup:
+        previous_files = self._load_previous_files()
+        files = {}
+        unchanged = []
+        changed = []
+        for world_path in world_paths:
+            for source in self._walk(world_path):
+                relative = source.relative_to(server_path).as_posix()
+                stat = source.stat()
+                previous = previous_files.get(relative)
+                if (
+                    previous is not None
+                    and previous[0] == stat.st_size
+                    and previous[1] == stat.st_mtime_ns
+                    and self._object_path(previous[2]).exists()
+                ):
+                    unchanged.append((relative, previous))
+                else:
+                    changed.append((relative, source, stat))
+
+        for relative, entry in unchanged:
+            self._link(self._object_path(entry[2]), snapshot_path.joinpath(relative))
+            files[relative] = entry
+
+        stored_bytes = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(self._store, (item[1] for item in changed))
+            for (relative, source, stat), (digest, written) in zip(changed, results):
+                self._link(self._object_path(digest), snapshot_path.joinpath(relative))
+                files[relative] = [stat.st_size, stat.st_mtime_ns, digest]
+                stored_bytes += written
+
+        backup = Backup(
+            name=snapshot_path.name,
+            path=snapshot_path,
+            created=created,
+            file_count=len(files),
+            total_bytes=sum(entry[0] for entry in files.values()),
+            stored_bytes=stored_bytes,
+            duration=time.perf_counter() - start,
+        )
+        manifest = {
+            "created": created.isoformat(),
+            "files": files,
+            "stats": {
+                "total_bytes": backup.total_bytes,
+                "stored_bytes": backup.stored_bytes,
+                "duration": backup.duration,
+            },
+        }
+        with open(snapshot_path.joinpath(MANIFEST_FILENAME), "w") as file:
+            json.dump(manifest, file)
+
+        return backup
+
+    def apply_retention(self, retention: int) -> list[str]:
+        snapshots = self.list_snapshots()
+        expired = snapshots[:-retention] if retention > 0 else []
+        for path in expired:
+            shutil.rmtree(path)
+        if expired:
+            self._prune_objects()
+        return [path.name for path in expired]
+
+    def _load_previous_files(self) -> dict[str, list]:
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            return {}
+        with open(snapshots[-1].joinpath(MANIFEST_FILENAME)) as file:
+            return json.load(file)["files"]
+
+    def _prune_objects(self) -> None:
+        for directory in self.objects_path.iterdir():
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if path.stat().st_nlink <= 1:
+                    path.unlink()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_path.joinpath(digest[:2], digest[2:])
+
+    def _store(self, source: Path) -> tuple[str, int]:
+        hasher = hashlib.blake2b(digest_size=20)
+        fd, temp_name = tempfile.mkstemp(dir=self.objects_path, prefix=".tmp-")
+        try:
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+                while chunk := src.read(CHUNK_SIZE):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+            digest = hasher.hexdigest()
+            object_path = self._object_path(digest)
+            if object_path.exists():
+                os.unlink(temp_name)
+                return digest, 0
+            object_path.parent.mkdir(exist_ok=True)
+            shutil.copystat(source, temp_name)
+            size = os.path.getsize(temp_name)
+            os.replace(temp_name, object_path)
+            return digest, size
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+            raise
+
+    @staticmethod
+    def _link(source: Path, destination: Path) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.link(source, destination)
+
+    @staticmethod
+    def _walk(path: Path):
+        for root, _, filenames in os.walk(path):
+            for filename in filenames:
+                if filename not in IGNORED_FILENAMES:
+                    yield Path(root, filename)
+
+
+class BackupManager:
+    SAVED_REGEX = re.compile(r"Saved the game")
+    SAVE_TIMEOUT = 60
+
+    def __init__(
+        self,
+        *,
+        server_configuration: ServerConfiguration,
+        server_console: ServerConsole,
+        server_log: ServerLog,
+        backup_path: Path,
+        retention: int,
+    ):
+        self.server_configuration = server_configuration
+        self.server_console = server_console
+        self.server_log = server_log
+        self.store = BackupStore(path=backup_path)
+        self.retention = retention
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def create_backup(self) -> Backup:
+        async with self._lock:
+            saves_disabled = await self.server_console.send_command("save-off")
+            try:
+                if saves_disabled:
+                    saved = self.server_log.expect_line(self.SAVED_REGEX)
+                    await self.server_console.send_command("save-all flush")
+                    if not await self.server_log.wait_for(
+                        saved, timeout=self.SAVE_TIMEOUT
+                    ):
+                        raise BackupError(
+                            "The server did not finish saving the world in time, "
+                            "so no backup was taken"
+                        )
+                backup = await asyncio.to_thread(
+                    self.store.snapshot,
+                    server_path=self.server_configuration.server_path,
+                    world_paths=self.server_configuration.world_paths,
+                )
+            finally:
+                if saves_disabled:
+                    await self.server_console.send_command("save-on")
+            await asyncio.to_thread(self.store.apply_retention, self.retention)
+            return backup
+
+    async def list_backups(self) -> list[Backup]:
+        return await asyncio.to_thread(self._list_backups)
+
+    def _list_backups(self) -> list[Backup]:
+        return [Backup.from_manifest(path) for path in self.store.list_snapshots()]
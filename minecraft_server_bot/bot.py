@@ -1,15 +1,33 @@
 import asyncio
+import datetime as dt
 from functools import wraps
 from pathlib import Path
 
 import discord
+from discord.ext import pages
 from tortoise import transactions
 
+from .backup import BackupError
 from .controller import ServerController
-from .database import initialise_database
-from .embeds import get_mods_embed
+from .database import close_database, initialise_database
+from .embeds import (
+    get_backup_embed,
+    get_backups_embed,
+    get_jobs_embed,
+    get_log_search_embeds,
+    get_mods_embed,
+    get_perf_embed,
+    get_playtime_embed,
+    get_top_players_embed,
+    get_whitelist_embed,
+    get_world_embed,
+)
+from .jobs import ScheduledJobManager
+from .logsearch import parse_time
 from .messages import delete_existing_guild_message
 from .models import BotMessage
+from .pregen import WORLDS
+from .profiler import LoopProfiler
 
 
 class BotApplication:
@@ -21,18 +39,68 @@ class BotApplication:
         session_name: str | None = None,
         database_config: dict,
         max_wait_for_online: int = 30,
+        backup_path: Path | str | None = None,
+        backup_retention: int = 7,
+        console_channel_id: int | None = None,
+        console_interval: float = 1.0,
+        console_level: str = "INFO",
+        console_filter: str | None = None,
+        chat_channel_id: int | None = None,
+        control_socket_path: Path | str | None = None,
+        profiler_enabled: bool = False,
+        profiler_threshold: float = 0.1,
+        profiler_dump_path: Path | str = "perf.json",
+        sharded: bool = False,
+        fanout_concurrency: int = 4,
+        priority_guild_ids: list[int] | None = None,
     ):
         self.server_path: Path = server_path
         self.executable_filename: str = executable_filename
         self.session_name: str | None = session_name
         self.database_config: dict = database_config
         self.max_wait_for_online = max_wait_for_online
+        self.backup_path: Path = (
+            Path(backup_path)
+            if backup_path is not None
+            else Path(server_path).joinpath("backups")
+        )
+        self.backup_retention: int = backup_retention
+        self.console_channel_id: int | None = console_channel_id
+        self.console_interval: float = console_interval
+        self.console_level: str = console_level
+        self.console_filter: str | None = console_filter
+        self.chat_channel_id: int | None = chat_channel_id
+        self.control_socket_path: Path | str | None = control_socket_path
+        self.profiler: LoopProfiler | None = (
+            LoopProfiler(threshold=profiler_threshold) if profiler_enabled else None
+        )
+        self.profiler_dump_path: Path = Path(profiler_dump_path)
+        self.sharded: bool = sharded
+        self.fanout_concurrency: int = fanout_concurrency
+        self.priority_guild_ids: list[int] = priority_guild_ids or []
+        self.controller: ServerController | None = None
         self._ready: asyncio.Event = asyncio.Event()
         self._initialise_bot()
 
     def _initialise_bot(self):
         intents = discord.Intents.default()
-        self.client = discord.Bot(intents=intents)
+        if self.chat_channel_id is not None:
+            intents.message_content = True
+        bot_class = discord.AutoShardedBot if self.sharded else discord.Bot
+        self.client = bot_class(intents=intents)
+        close_client = self.client.close
+
+        async def close():
+            # Called when the bot is stopped, so that player sessions that are
+            # still buffered are saved
+            try:
+                if self.controller is not None and not self.client.is_closed():
+                    await self.controller.close()
+                    await close_database()
+            finally:
+                await close_client()
+
+        self.client.close = close
 
         @staticmethod
         def _wait_for_ready(coro):
@@ -47,6 +115,8 @@ class BotApplication:
 
         @self.client.event
         async def on_ready():
+            if self.profiler is not None:
+                self.profiler.start()
             await initialise_database(self.database_config)
             activity = discord.Activity(
                 type=discord.ActivityType.listening,
@@ -58,12 +128,27 @@ class BotApplication:
                 server_path=self.server_path,
                 executable_filename=self.executable_filename,
                 max_wait_for_online=self.max_wait_for_online,
+                backup_path=self.backup_path,
+                backup_retention=self.backup_retention,
+                console_channel_id=self.console_channel_id,
+                console_interval=self.console_interval,
+                console_level=self.console_level,
+                console_filter=self.console_filter,
+                chat_channel_id=self.chat_channel_id,
+                control_socket_path=self.control_socket_path,
+                fanout_concurrency=self.fanout_concurrency,
+                priority_guild_ids=self.priority_guild_ids,
             )
             self.client.add_view(self.controller.view)
             await self.client.change_presence(activity=activity)
             await self.controller.wait_until_ready()
             self._ready.set()
 
+        @self.client.event
+        async def on_message(message: discord.Message):
+            if self._ready.is_set() and self.controller.chat_bridge is not None:
+                self.controller.chat_bridge.push_discord_message(message)
+
         @self.client.slash_command(
             name="controls",
             description="Generates a fancy textbox with buttons to control the server",
@@ -93,12 +178,385 @@ class BotApplication:
         )
         @_wait_for_ready
         async def mods(ctx: discord.ApplicationContext):
-            mods = self.controller.server_configuration.get_mods()
+            mods = await asyncio.to_thread(
+                self.controller.server_configuration.get_mods
+            )
             if not mods:
                 await ctx.respond("There are no mods loaded.")
             else:
                 for start in range(0, len(mods), 25):
                     await ctx.respond(embed=get_mods_embed(mods[start : start + 25]))
 
+        @self.client.slash_command(
+            name="backup",
+            description="Takes a snapshot of the server world",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+        @_wait_for_ready
+        async def backup(ctx: discord.ApplicationContext):
+            if self.controller.backup_manager.running:
+                await ctx.respond("A backup is already in progress.")
+                return
+            if not ctx.response.is_done():
+                await ctx.defer()
+            try:
+                backup = await self.controller.handle_backup()
+            except BackupError as e:
+                await ctx.respond(str(e))
+            else:
+                await ctx.respond(embed=get_backup_embed(backup))
+
+        @self.client.slash_command(
+            name="backups",
+            description="Lists the snapshots of the server world",
+        )
+        @_wait_for_ready
+        async def backups(ctx: discord.ApplicationContext):
+            backups = await self.controller.backup_manager.list_backups()
+            if not backups:
+                await ctx.respond("There are no backups.")
+            else:
+                await ctx.respond(embed=get_backups_embed(backups[-25:]))
+
+        @self.client.slash_command(
+            name="world",
+            description="Shows statistics about the server world",
+        )
+        @_wait_for_ready
+        async def world(ctx: discord.ApplicationContext):
+            if not ctx.response.is_done():
+                await ctx.defer()
+            summary = await self.controller.world_analyzer.analyze()
+            if not summary.regions:
+                await ctx.respond("There are no region files in the world.")
+            else:
+                await ctx.respond(embed=get_world_embed(summary))
+
+        @self.client.slash_command(
+            name="console",
+            description="Sends a command to the server console",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+        @discord.option("command", description="The command to send")
+        @_wait_for_ready
+        async def console(ctx: discord.ApplicationContext, command: str):
+            if await self.controller.handle_command(command):
+                await ctx.respond(f"Sent `{command}` to the server.", ephemeral=True)
+            else:
+                await ctx.respond("The server is offline.", ephemeral=True)
+
+        @self.client.slash_command(
+            name="playtime",
+            description="Shows the playtime of a player, or the top players",
+        )
+        @discord.option(
+            "player",
+            description="The name of the player",
+            required=False,
+        )
+        @_wait_for_ready
+        async def playtime(ctx: discord.ApplicationContext, player: str | None = None):
+            recorder = self.controller.session_recorder
+            if player is None:
+                await ctx.respond(
+                    embed=get_top_players_embed(
+                        players=await recorder.get_top_players(days=30),
+                        peak=await recorder.get_peak(days=30),
+                        days=30,
+                    )
+                )
+            else:
+                seconds, last_seen = await recorder.get_playtime(player)
+                await ctx.respond(
+                    embed=get_playtime_embed(
+                        player=player,
+                        seconds=seconds,
+                        last_seen=last_seen,
+                        online=player in self.controller.server_info.players,
+                    )
+                )
+
+        schedule = self.client.create_group(
+            "schedule",
+            "Manages scheduled jobs",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+
+        @schedule.command(
+            name="add",
+            description="Schedules a job using a cron expression",
+        )
+        @discord.option("name", description="A unique name for the job")
+        @discord.option(
+            "cron",
+            description="When to run the job, e.g. '0 4 * * *' for 04:00 every day",
+        )
+        @discord.option(
+            "action",
+            description="What the job does",
+            choices=ScheduledJobManager.ACTIONS,
+        )
+        @discord.option(
+            "argument",
+            description="The message to broadcast or the command to run",
+            required=False,
+        )
+        @_wait_for_ready
+        async def schedule_add(
+            ctx: discord.ApplicationContext,
+            name: str,
+            cron: str,
+            action: str,
+            argument: str | None = None,
+        ):
+            try:
+                await self.controller.job_manager.add_job(
+                    name=name,
+                    cron=cron,
+                    action=action,
+                    argument=argument,
+                )
+            except ValueError as e:
+                await ctx.respond(str(e), ephemeral=True)
+            else:
+                await ctx.respond(f"Scheduled job `{name}`.", ephemeral=True)
+
+        @schedule.command(
+            name="remove",
+            description="Removes a scheduled job",
+        )
+        @discord.option("name", description="The name of the job")
+        @_wait_for_ready
+        async def schedule_remove(ctx: discord.ApplicationContext, name: str):
+            if await self.controller.job_manager.remove_job(name):
+                await ctx.respond(f"Removed job `{name}`.", ephemeral=True)
+            else:
+                await ctx.respond(f"There is no job named `{name}`.", ephemeral=True)
+
+        @schedule.command(
+            name="list",
+            description="Lists the scheduled jobs",
+        )
+        @_wait_for_ready
+        async def schedule_list(ctx: discord.ApplicationContext):
+            jobs = await self.controller.job_manager.list_jobs()
+            if not jobs:
+                await ctx.respond("There are no scheduled jobs.", ephemeral=True)
+            else:
+                await ctx.respond(embed=get_jobs_embed(jobs[:25]), ephemeral=True)
+
+        whitelist = self.client.create_group(
+            "whitelist",
+            "Manages the server whitelist",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+
+        @whitelist.command(
+            name="add",
+            description="Adds a player to the whitelist",
+        )
+        @discord.option("player", description="The name of the player")
+        @_wait_for_ready
+        async def whitelist_add(ctx: discord.ApplicationContext, player: str):
+            try:
+                added = await self.controller.player_directory.whitelist_add(player)
+            except ValueError as e:
+                await ctx.respond(str(e), ephemeral=True)
+                return
+            if added:
+                await ctx.respond(f"Added `{player}` to the whitelist.", ephemeral=True)
+            else:
+                await ctx.respond("The server is offline.", ephemeral=True)
+
+        @whitelist.command(
+            name="remove",
+            description="Removes a player from the whitelist",
+        )
+        @discord.option("player", description="The name of the player")
+        @_wait_for_ready
+        async def whitelist_remove(ctx: discord.ApplicationContext, player: str):
+            try:
+                removed = await self.controller.player_directory.whitelist_remove(
+                    player
+                )
+            except ValueError as e:
+                await ctx.respond(str(e), ephemeral=True)
+                return
+            if removed:
+                await ctx.respond(
+                    f"Removed `{player}` from the whitelist.", ephemeral=True
+                )
+            else:
+                await ctx.respond("The server is offline.", ephemeral=True)
+
+        @whitelist.command(
+            name="list",
+            description="Lists the players on the whitelist",
+        )
+        @_wait_for_ready
+        async def whitelist_list(ctx: discord.ApplicationContext):
+            players = self.controller.player_directory.whitelisted_players
+            if not players:
+                await ctx.respond("The whitelist is empty.", ephemeral=True)
+            else:
+                await ctx.respond(embed=get_whitelist_embed(players), ephemeral=True)
+
+        @self.client.slash_command(
+            name="op",
+            description="Makes a player a server operator",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+        @discord.option("player", description="The name of the player")
+        @_wait_for_ready
+        async def op(ctx: discord.ApplicationContext, player: str):
+            try:
+                opped = await self.controller.player_directory.op(player)
+            except ValueError as e:
+                await ctx.respond(str(e), ephemeral=True)
+                return
+            if opped:
+                await ctx.respond(f"Made `{player}` a server operator.", ephemeral=True)
+            else:
+                await ctx.respond("The server is offline.", ephemeral=True)
+
+        pregen = self.client.create_group(
+            "pregen",
+            "Pre-generates chunks using Chunky while no players are online",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+
+        @pregen.command(
+            name="start",
+            description="Starts pre-generating chunks in a square around a center",
+        )
+        @discord.option("radius", int, description="The radius in blocks", min_value=1)
+        @discord.option(
+            "world",
+            description="The dimension to pre-generate",
+            choices=WORLDS,
+            default=WORLDS[0],
+        )
+        @discord.option("center_x", int, description="The center X", default=0)
+        @discord.option("center_z", int, description="The center Z", default=0)
+        @discord.option(
+            "window_start",
+            description="Only run after this time of day, e.g. '02:00'",
+            required=False,
+        )
+        @discord.option(
+            "window_end",
+            description="Only run before this time of day, e.g. '06:00'",
+            required=False,
+        )
+        @_wait_for_ready
+        async def pregen_start(
+            ctx: discord.ApplicationContext,
+            radius: int,
+            world: str = WORLDS[0],
+            center_x: int = 0,
+            center_z: int = 0,
+            window_start: str | None = None,
+            window_end: str | None = None,
+        ):
+            try:
+                window = None
+                if window_start or window_end:
+                    window = (
+                        dt.time.fromisoformat(window_start or "00:00"),
+                        dt.time.fromisoformat(window_end or "00:00"),
+                    )
+                started = await self.controller.pregen_manager.start(
+                    radius=radius,
+                    world=world,
+                    center=(center_x, center_z),
+                    window=window,
+                )
+            except ValueError as e:
+                await ctx.respond(str(e), ephemeral=True)
+                return
+            if started:
+                await ctx.respond(
+                    f"Pre-generation of `{world}` will run while no players "
+                    "are online.",
+                    ephemeral=True,
+                )
+            else:
+                await ctx.respond("The server is offline.", ephemeral=True)
+
+        @pregen.command(
+            name="cancel",
+            description="Cancels pre-generation",
+        )
+        @_wait_for_ready
+        async def pregen_cancel(ctx: discord.ApplicationContext):
+            if await self.controller.pregen_manager.cancel():
+                await ctx.respond("Cancelled pre-generation.", ephemeral=True)
+            else:
+                await ctx.respond("Pre-generation is not in progress.", ephemeral=True)
+
+        logs = self.client.create_group(
+            "logs",
+            "Searches the server logs",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+
+        @logs.command(
+            name="search",
+            description="Searches the current and archived server logs",
+        )
+        @discord.option("pattern", description="A regular expression to search for")
+        @discord.option(
+            "since",
+            description="Only lines after this time, e.g. '2024-07-20 14:30' or '2h'",
+            required=False,
+        )
+        @discord.option(
+            "until",
+            description="Only lines before this time, e.g. '2024-07-21' or '30m'",
+            required=False,
+        )
+        @_wait_for_ready
+        async def logs_search(
+            ctx: discord.ApplicationContext,
+            pattern: str,
+            since: str | None = None,
+            until: str | None = None,
+        ):
+            if not ctx.response.is_done():
+                await ctx.defer(ephemeral=True)
+            try:
+                result = await self.controller.log_searcher.search(
+                    pattern,
+                    since=parse_time(since) if since else None,
+                    until=parse_time(until) if until else None,
+                )
+            except ValueError as e:
+                await ctx.respond(str(e), ephemeral=True)
+                return
+            paginator = pages.Paginator(pages=get_log_search_embeds(result))
+            await paginator.respond(ctx, ephemeral=True)
+
+        debug = self.client.create_group(
+            "debug",
+            "Shows diagnostics about the bot",
+            default_member_permissions=discord.Permissions(administrator=True),
+        )
+
+        @debug.command(
+            name="perf",
+            description="Shows the worst event loop stalls since the bot started",
+        )
+        @_wait_for_ready
+        async def debug_perf(ctx: discord.ApplicationContext):
+            if self.profiler is None:
+                await ctx.respond("The profiler is not enabled.", ephemeral=True)
+                return
+            path = await asyncio.to_thread(self.profiler.dump, self.profiler_dump_path)
+            await ctx.respond(
+                embed=get_perf_embed(self.profiler),
+                file=discord.File(path),
+                ephemeral=True,
+            )
+
     def run(self, *args, **kwargs):
         self.client.run(*args, **kwargs)
@@ -0,0 +1,158 @@
+import json
+import re
+import string
+from collections import deque
+from collections.abc import Callable
+
+import discord
+
+from .scheduler import Scheduler
+from .server import ServerConsole, ServerInfo
+from .streaming import ChannelBatcher, format_plain
+
+# Forge and NeoForge add the name of the logger after the thread and level
+LOG_MESSAGE_REGEX = re.compile(
+    r"^\[[^\]]+\] \[(?P<thread>[^\]]+)/(?P<level>[A-Z]+)\]"
+    r"(?: \[[^\]]*\])?: (?P<message>.*)$"
+)
+SERVER_THREAD = "Server thread"
+CHAT_REGEX = re.compile(r"^(?:\[Not Secure\] )?<(?P<player>\w+)> (?P<message>.*)$")
+JOIN_REGEX = re.compile(r"^(?P<player>\w+) joined the game$")
+LEAVE_REGEX = re.compile(r"^(?P<player>\w+) left the game$")
+DEATH_REGEX = re.compile(
+    r"^(?P<player>\w+) (?:"
+    r"was |were |died|drowned|blew up|burned to death|hit the ground|fell |"
+    r"went (?:up in flames|off with a bang)|walked into |tried to swim|"
+    r"experienced kinetic energy|froze to death|starved to death|"
+    r"suffocated in a wall|discovered the floor was lava|withered away|"
+    r"left the confines of this world|didn't want to live"
+    r")"
+)
+MAX_TELLRAW_LINES = 10
+
+
+def get_server_message(line: str) -> str | None:
+    # Chat, joins, leaves and deaths are only logged by the main server thread,
+    # so lines from mods or other threads are never mistaken for them
+    match = LOG_MESSAGE_REGEX.match(line)
+    if (
+        match is None
+        or match.group("thread") != SERVER_THREAD
+        or match.group("level") != "INFO"
+    ):
+        return None
+    return match.group("message")
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    parts = tuple(
+        (literal, field) for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+    def render(**values) -> str:
+        return "".join(
+            literal + (str(values[field]) if field else "") for literal, field in parts
+        )
+
+    return render
+
+
+class ChatBridge:
+    def __init__(
+        self,
+        *,
+        client: discord.Client,
+        scheduler: Scheduler,
+        channel_id: int,
+        server_console: ServerConsole,
+        server_info: ServerInfo,
+        interval: float = 0.5,
+        max_messages: int = 50,
+        chat_template: str = "**{player}**: {message}",
+        join_template: str = "➡️ **{player}** joined the game",
+        leave_template: str = "⬅️ **{player}** left the game",
+        death_template: str = "💀 {message}",
+        game_template: str = "[Discord] <{author}> {message}",
+    ):
+        self.scheduler = scheduler
+        self.channel_id = channel_id
+        self.interval = interval
+        self.server_console = server_console
+        self.server_info = server_info
+        self.to_discord = ChannelBatcher(
+            client=client,
+            scheduler=scheduler,
+            name="chat_to_discord",
+            channel_id=channel_id,
+            interval=interval,
+            max_lines=max_messages,
+            formatter=format_plain,
+            overhead=0,
+        )
+        self.dropped_to_game: int = 0
+        self._to_game: deque[str] = deque(maxlen=max_messages)
+        self._joined: set[str] = set()
+        self._events = [
+            (CHAT_REGEX, compile_template(chat_template)),
+            (JOIN_REGEX, compile_template(join_template)),
+            (LEAVE_REGEX, compile_template(leave_template)),
+            (DEATH_REGEX, compile_template(death_template)),
+        ]
+        self._game_template = compile_template(game_template)
+
+    def start(self) -> None:
+        self.to_discord.start()
+        self.scheduler.add_periodic(
+            "chat_to_game", self.interval, self._game_flush_task
+        )
+
+    def push_lines(self, lines: list[str]) -> None:
+        messages = []
+        for line in lines:
+            if (message := get_server_message(line)) is None:
+                continue
+            for regex, template in self._events:
+                if event := regex.match(message):
+                    player = event["player"]
+                    if regex is JOIN_REGEX:
+                        self._joined.add(player)
+                    elif regex is LEAVE_REGEX:
+                        self._joined.discard(player)
+                    elif regex is DEATH_REGEX and not self._online(player):
+                        break
+                    messages.append(
+                        template(
+                            player=discord.utils.escape_markdown(player),
+                            message=discord.utils.escape_markdown(
+                                event.groupdict().get("message", message)
+                            ),
+                        )
+                    )
+                    break
+        if messages:
+            self.to_discord.push(messages)
+
+    def _online(self, player: str) -> bool:
+        # Players who joined since the player list was last polled are included
+        return player in self._joined or player in self.server_info.players
+
+    def push_discord_message(self, message: discord.Message) -> None:
+        if message.channel.id != self.channel_id or message.author.bot:
+            return
+        content = " ".join(message.clean_content.split())
+        if not content:
+            return
+        if len(self._to_game) == self._to_game.maxlen:
+            self.dropped_to_game += 1
+        self._to_game.append(
+            self._game_template(author=message.author.display_name, message=content)
+        )
+
+    async def _game_flush_task(self) -> None:
+        if not self._to_game:
+            return
+        lines = []
+        while self._to_game and len(lines) < MAX_TELLRAW_LINES:
+            lines.append(self._to_game.popleft())
+        component = json.dumps({"text": "\n".join(lines)}, ensure_ascii=False)
+        await self.server_console.send_command(f"tellraw @a {component}")
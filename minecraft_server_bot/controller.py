@@ -4,28 +4,54 @@ from pathlib import Path
 import discord
 from tortoise.queryset import QuerySet
 
-from minecraft_server_bot.messages import fetch_message_from_record
-
+from .api import ControlServer
+from .backup import Backup, BackupManager
+from .chat import ChatBridge
+from .fanout import MessageFanOut
+from .jobs import ScheduledJobManager
+from .logsearch import LogSearcher
 from .models import BotMessage
+from .players import PlayerDirectory
+from .pregen import PregenManager
+from .scheduler import Scheduler
 from .server import (
     ServerConfiguration,
     ServerConsole,
     ServerInfo,
+    ServerLog,
     ServerManager,
     ServerState,
 )
+from .sessions import PlayerSessionRecorder
+from .startup import StartupTracker
+from .streaming import ConsoleStreamer
 from .view import ServerView
+from .world import WorldAnalyzer
 
 
 class ServerController:
     def __init__(self, *, client: discord.Client) -> None:
         self.client: discord.Client = client
         self._ready: asyncio.Event = asyncio.Event()
+        self.scheduler: Scheduler
         self.server_configuration: ServerConfiguration
         self.server_state: ServerState
         self.server_console: ServerConsole
+        self.server_log: ServerLog
         self.server_info: ServerInfo
         self.server_manager: ServerManager
+        self.startup_tracker: StartupTracker
+        self.player_directory: PlayerDirectory
+        self.pregen_manager: PregenManager
+        self.backup_manager: BackupManager
+        self.job_manager: ScheduledJobManager
+        self.session_recorder: PlayerSessionRecorder
+        self.world_analyzer: WorldAnalyzer
+        self.log_searcher: LogSearcher
+        self.console_streamer: ConsoleStreamer | None = None
+        self.chat_bridge: ChatBridge | None = None
+        self.control_server: ControlServer | None = None
+        self.fanout: MessageFanOut
         self.view: ServerView
 
     @classmethod
@@ -37,10 +63,22 @@ class ServerController:
         server_path: Path | str,
         executable_filename: str,
         max_wait_for_online: int,
+        backup_path: Path | str,
+        backup_retention: int,
+        console_channel_id: int | None = None,
+        console_interval: float = 1.0,
+        console_level: str = "INFO",
+        console_filter: str | None = None,
+        chat_channel_id: int | None = None,
+        control_socket_path: Path | str | None = None,
+        fanout_concurrency: int = 4,
+        priority_guild_ids: list[int] | None = None,
     ) -> "ServerController":
         server_path = Path(server_path)
 
         self = cls(client=client)
+        self.scheduler = Scheduler()
+        self.scheduler.start()
         self.server_configuration = ServerConfiguration(server_path=server_path)
         self.server_configuration.load()
         self.server_state = await ServerState.create(
@@ -53,20 +91,100 @@ class ServerController:
             executable_filename=executable_filename,
             server_state=self.server_state,
         )
+        self.server_log = await ServerLog.create(
+            server_path=server_path,
+            scheduler=self.scheduler,
+        )
         self.server_info = await ServerInfo.create(
             server_path=server_path,
             server_state=self.server_state,
             server_console=self.server_console,
+            scheduler=self.scheduler,
+        )
+        self.world_analyzer = WorldAnalyzer(
+            server_configuration=self.server_configuration
+        )
+        self.startup_tracker = await StartupTracker.create(
+            server_configuration=self.server_configuration,
+            world_analyzer=self.world_analyzer,
+            server_log=self.server_log,
+            scheduler=self.scheduler,
         )
         self.server_manager = await ServerManager.create(
             server_state=self.server_state,
             server_console=self.server_console,
             max_wait_for_online=max_wait_for_online,
+            startup_tracker=self.startup_tracker,
+            scheduler=self.scheduler,
+        )
+        self.player_directory = await PlayerDirectory.create(
+            server_path=server_path,
+            server_console=self.server_console,
+            scheduler=self.scheduler,
+        )
+        self.pregen_manager = await PregenManager.create(
+            scheduler=self.scheduler,
+            server_console=self.server_console,
+            server_info=self.server_info,
+            server_manager=self.server_manager,
+        )
+        self.server_log.add_line_listener(self.pregen_manager.push_lines)
+        self.session_recorder = await PlayerSessionRecorder.create(
+            server_info=self.server_info,
+            scheduler=self.scheduler,
+        )
+        self.job_manager = await ScheduledJobManager.create(
+            scheduler=self.scheduler,
+            server_state=self.server_state,
+            server_console=self.server_console,
+            server_manager=self.server_manager,
+        )
+        self.backup_manager = BackupManager(
+            server_configuration=self.server_configuration,
+            server_console=self.server_console,
+            server_log=self.server_log,
+            backup_path=Path(backup_path),
+            retention=backup_retention,
+        )
+        self.log_searcher = LogSearcher(server_path=server_path)
+        if console_channel_id is not None:
+            self.console_streamer = ConsoleStreamer(
+                client=client,
+                scheduler=self.scheduler,
+                channel_id=console_channel_id,
+                interval=console_interval,
+                level=console_level,
+                pattern=console_filter,
+            )
+            self.server_log.add_line_listener(self.console_streamer.push_lines)
+            self.console_streamer.start()
+        if chat_channel_id is not None:
+            self.chat_bridge = ChatBridge(
+                client=client,
+                scheduler=self.scheduler,
+                channel_id=chat_channel_id,
+                server_console=self.server_console,
+                server_info=self.server_info,
+            )
+            self.server_log.add_line_listener(self.chat_bridge.push_lines)
+            self.chat_bridge.start()
+        if control_socket_path is not None:
+            self.control_server = await ControlServer.create(
+                controller=self,
+                path=Path(control_socket_path),
+            )
+        self.fanout = MessageFanOut(
+            client=client,
+            concurrency=fanout_concurrency,
+            priority_guild_ids=priority_guild_ids,
         )
         self.view = ServerView(self)
 
         self.server_manager.add_listener(self.server_listener)
         self.server_info.add_listener(self.server_listener)
+        self.player_directory.add_listener(self.player_directory_listener)
+        self.pregen_manager.add_listener(self.pregen_listener)
+        self.startup_tracker.add_listener(self.startup_listener)
         return self
 
     async def server_listener(self, _) -> None:
@@ -74,6 +192,21 @@ class ServerController:
             await self.server_info.update_public_ip()
         await self._render_and_update_view()
 
+    async def player_directory_listener(self, _) -> None:
+        if self.server_info.player_count:
+            await self._render_and_update_view()
+
+    async def pregen_listener(self, _) -> None:
+        await self._render_and_update_view()
+
+    async def startup_listener(self, _) -> None:
+        if self.server_manager.state == "starting":
+            await self._render_and_update_view()
+
+    async def close(self) -> None:
+        self.scheduler.stop()
+        await self.session_recorder.close()
+
     async def handle_start(self) -> None:
         await self.server_manager.start_server()
 
@@ -83,6 +216,51 @@ class ServerController:
     async def handle_restart(self) -> None:
         await self.server_manager.restart_server()
 
+    async def handle_backup(self) -> Backup:
+        return await self.backup_manager.create_backup()
+
+    async def handle_command(self, command: str) -> bool:
+        return await self.server_console.send_command(command)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.server_manager.state,
+            "host": self.server_configuration.host,
+            "port": self.server_configuration.port,
+            "public_ip": self.server_info.public_ip,
+            "player_count": self.server_info.player_count,
+            "players": self.server_info.players,
+        }
+
+    def metrics(self) -> dict:
+        metrics = {
+            "scheduler": {
+                "wakeups": self.scheduler.wakeups,
+                "jobs": {
+                    job.name: {"runs": job.runs, "skipped": job.skipped}
+                    for job in self.scheduler.jobs
+                },
+            },
+            "backup": {"running": self.backup_manager.running},
+            "fanout": {
+                "sent": self.fanout.sent,
+                "failed": self.fanout.failed,
+                "superseded": self.fanout.superseded,
+            },
+        }
+        if self.console_streamer is not None:
+            metrics["console_stream"] = {
+                "sent": self.console_streamer.batcher.sent,
+                "dropped": self.console_streamer.batcher.dropped,
+            }
+        if self.chat_bridge is not None:
+            metrics["chat_bridge"] = {
+                "sent": self.chat_bridge.to_discord.sent,
+                "dropped_to_discord": self.chat_bridge.to_discord.dropped,
+                "dropped_to_game": self.chat_bridge.dropped_to_game,
+            }
+        return metrics
+
     async def wait_until_ready(self) -> None:
         await self._ready.wait()
 
@@ -93,18 +271,8 @@ class ServerController:
     async def _render_and_update_view(self):
         await self.view.render()
         self._ready.set()
-        messages: list[discord.Message] = filter(
-            None,
-            await asyncio.gather(
-                *(
-                    fetch_message_from_record(record=record, client=self.client)
-                    for record in await self._all_controls_messages
-                )
-            ),
-        )
-        await asyncio.gather(
-            *(
-                message.edit(view=self.view, embed=self.view.embed)
-                for message in messages
-            )
+        self.fanout.publish(
+            await self._all_controls_messages,
+            view=self.view,
+            embed=self.view.embed,
         )
@@ -3,3 +3,7 @@ from tortoise import Tortoise
 
 async def initialise_database(config):
     await Tortoise.init(config=config)
+
+
+async def close_database():
+    await Tortoise.close_connections()
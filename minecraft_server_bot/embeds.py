@@ -2,10 +2,22 @@ import datetime as dt
 
 import discord
 
+from .backup import Backup
+from .logsearch import LogMatch, LogSearchResult
+from .models import ScheduledJob
 from .mods import Mod
+from .players import PlayerDirectory
+from .pregen import PregenManager
+from .profiler import LoopProfiler
 from .server import ServerConfiguration, ServerInfo
+from .startup import StartupTracker, get_duration
+from .streaming import format_code_block
+from .world import RegionStats, WorldSummary
 
 DEFAULT_PORT = 25565
+MAX_EMBED_LENGTH = 6000
+MAX_FIELD_LENGTH = 1024
+MAX_FRAME_LENGTH = 150
 
 
 def generate_base_embed():
@@ -16,6 +28,39 @@ def generate_base_embed():
     return embed
 
 
+def format_bytes(size: float) -> str:
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def format_duration(seconds: int) -> str:
+    hours, seconds = divmod(int(seconds), 3600)
+    minutes = seconds // 60
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+def shorten(text: str, length: int) -> str:
+    return text if len(text) <= length else text[: length - 1] + "…"
+
+
+def format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def display_dedup_ratio(backup: Backup) -> str:
+    if not backup.stored_bytes:
+        return "all files reused"
+    return f"{backup.dedup_ratio:.1f}x"
+
+
 def display_public_address(public_ip: str | None, port: int) -> str:
     if public_ip is None:
         return None
@@ -25,11 +70,96 @@ def display_public_address(public_ip: str | None, port: int) -> str:
         return f"{public_ip}:{port}"
 
 
+def display_player(name: str, player_directory: PlayerDirectory) -> str:
+    player = player_directory.get_player(name)
+    markers = ("🛡️" if player.op else "") + ("📋" if player.whitelisted else "")
+    return f"- {name} {markers}" if markers else f"- {name}"
+
+
+def display_players(players: list[str], player_directory: PlayerDirectory) -> str:
+    lines = []
+    size = 0
+    for index, player in enumerate(players):
+        line = display_player(player, player_directory)
+        # Leaves room for the line counting the players that are not shown
+        if size + len(line) + 1 > MAX_FIELD_LENGTH - 20:
+            lines.append(f"... and {len(players) - index} more")
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def display_pregen(pregen_manager: PregenManager) -> str:
+    progress = pregen_manager.progress
+    if pregen_manager.state == "finished":
+        value = "✅ Finished"
+        if pregen_manager.total_time is not None:
+            value += f" in {format_duration(pregen_manager.total_time.total_seconds())}"
+        return value
+    value = {
+        "waiting": "⏳ Waiting",
+        "running": "⚙️ Running",
+        "paused": "⏸️ Paused",
+    }[pregen_manager.state]
+    if pregen_manager.state != "running":
+        value += " until no players are online"
+        if pregen_manager.window is not None:
+            start, end = pregen_manager.window
+            value += f" between {start.strftime('%H:%M')} and {end.strftime('%H:%M')}"
+    if progress is not None:
+        value += f"\n{progress.percent:.2f}% ({progress.chunks} chunks)"
+        if pregen_manager.state == "running" and progress.rate is not None:
+            value += f", {progress.rate:.1f} chunks/s"
+        if pregen_manager.state == "running" and progress.eta is not None:
+            value += f", ETA {format_duration(progress.eta.total_seconds())}"
+    return value
+
+
+def display_startup_progress(startup_tracker: StartupTracker) -> str:
+    elapsed = startup_tracker.elapsed or 0
+    estimate = startup_tracker.estimate()
+    if estimate is None:
+        value = f"{format_seconds(elapsed)} elapsed, no previous starts to compare"
+    else:
+        fraction = min(elapsed / estimate, 1)
+        filled = round(fraction * 10)
+        value = (
+            f"`{'█' * filled}{'░' * (10 - filled)}` {fraction:.0%}\n"
+            f"{format_seconds(elapsed)} of about {format_seconds(estimate)}"
+        )
+        if elapsed < estimate:
+            value += f", ETA {format_seconds(estimate - elapsed)}"
+    if changes := startup_tracker.changes():
+        value += f"\n⚠️ Since the last start: {', '.join(changes)}"
+    return value
+
+
+def display_last_start(startup_tracker: StartupTracker) -> str | None:
+    record = startup_tracker.last_start
+    if record is None or (duration := get_duration(record)) is None:
+        return None
+    value = f"Took {format_seconds(duration)}"
+    if record.reported_seconds is not None:
+        value += f" (server reported {record.reported_seconds:.1f}s)"
+    slowdown = startup_tracker.slowdown(record)
+    changes = startup_tracker.changes(record)
+    if slowdown is not None and changes:
+        value += (
+            f"\n⚠️ {slowdown - 1:.0%} slower than usual, "
+            f"since the last start: {', '.join(changes)}"
+        )
+    return value
+
+
 def get_embed_for_server(
     *,
     state: str,
     server_info: ServerInfo,
     server_configuration: ServerConfiguration,
+    player_directory: PlayerDirectory,
+    pregen_manager: PregenManager,
+    startup_tracker: StartupTracker,
 ):
     status, description = {
         "stopped": ("Offline", "⛔ Server is offline"),
@@ -46,6 +176,12 @@ def get_embed_for_server(
     embed.title = "Minecraft Server"
     embed.description = description
     embed.add_field(name="Status", value=status, inline=True)
+    if state == "starting" and startup_tracker.starting:
+        embed.add_field(
+            name="Progress",
+            value=display_startup_progress(startup_tracker),
+            inline=False,
+        )
     if state == "started":
         embed.add_field(
             name="Player count",
@@ -57,12 +193,20 @@ def get_embed_for_server(
             value=(public_address if public_address is not None else "-"),
             inline=True,
         )
+        if (last_start := display_last_start(startup_tracker)) is not None:
+            embed.add_field(name="Last start", value=last_start, inline=False)
         if server_info.player_count:
             embed.add_field(
                 name="Players",
-                value="\n".join([f"- {player}" for player in server_info.players]),
+                value=display_players(server_info.players, player_directory),
                 inline=False,
             )
+    if pregen_manager.state != "idle":
+        embed.add_field(
+            name=f"Pre-generation of {pregen_manager.world}",
+            value=display_pregen(pregen_manager),
+            inline=False,
+        )
 
     return embed
 
@@ -78,3 +222,228 @@ def get_mods_embed(mods: list[Mod]):
         )
 
     return embed
+
+
+def get_backup_embed(backup: Backup):
+    embed = generate_base_embed()
+    embed.title = "Backup complete"
+    embed.description = f"💾 Snapshot `{backup.name}`"
+    embed.add_field(name="Files", value=backup.file_count, inline=True)
+    embed.add_field(name="Size", value=format_bytes(backup.total_bytes), inline=True)
+    embed.add_field(name="Stored", value=format_bytes(backup.stored_bytes), inline=True)
+    embed.add_field(name="Duration", value=f"{backup.duration:.1f} s", inline=True)
+    embed.add_field(
+        name="Throughput",
+        value=f"{format_bytes(backup.throughput)}/s",
+        inline=True,
+    )
+    embed.add_field(name="Dedup ratio", value=display_dedup_ratio(backup), inline=True)
+
+    return embed
+
+
+def get_backups_embed(backups: list[Backup]):
+    embed = generate_base_embed()
+    embed.title = "Backups"
+    for backup in reversed(backups):
+        embed.add_field(
+            name=backup.created.strftime("%Y-%m-%d %H:%M:%S"),
+            value=(
+                f"Size: {format_bytes(backup.total_bytes)}, "
+                f"stored: {format_bytes(backup.stored_bytes)}, "
+                f"dedup ratio: {display_dedup_ratio(backup)}"
+            ),
+            inline=False,
+        )
+
+    return embed
+
+
+def display_regions(regions: list[RegionStats], detail) -> str:
+    if not regions:
+        return "-"
+    return "\n".join(
+        f"- `{region.dimension}` {region.path.name}: {detail(region)}"
+        for region in regions
+    )
+
+
+def get_world_embed(summary: WorldSummary):
+    embed = generate_base_embed()
+    embed.title = "World"
+    embed.description = (
+        f"🗺️ {format_bytes(summary.total_bytes)} in {len(summary.regions)} regions "
+        f"(scanned in {summary.duration:.2f} s)"
+    )
+    for dimension, (regions, chunks, size) in summary.dimensions.items():
+        embed.add_field(
+            name=dimension,
+            value=f"Regions: {regions}\nChunks: {chunks}\nSize: {format_bytes(size)}",
+            inline=True,
+        )
+    embed.add_field(
+        name="Recently modified",
+        value=display_regions(
+            summary.recently_modified(),
+            lambda region: region.last_modified.strftime("%Y-%m-%d %H:%M"),
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name=f"Not modified in {summary.trim_age.days} days",
+        value=display_regions(
+            summary.trim_candidates(),
+            lambda region: (
+                f"{region.chunk_count} chunks, {format_bytes(region.size)}"
+            ),
+        ),
+        inline=False,
+    )
+
+    return embed
+
+
+def get_jobs_embed(jobs: list[ScheduledJob]):
+    embed = generate_base_embed()
+    embed.title = "Scheduled jobs"
+    for job in jobs:
+        value = f"`{job.cron}`: {job.action}"
+        if job.argument:
+            value += f" `{job.argument}`"
+        embed.add_field(name=job.name, value=value, inline=False)
+
+    return embed
+
+
+def get_playtime_embed(
+    *,
+    player: str,
+    seconds: int,
+    last_seen: dt.datetime | None,
+    online: bool,
+):
+    embed = generate_base_embed()
+    embed.title = player
+    embed.add_field(name="Playtime", value=format_duration(seconds), inline=True)
+    if online:
+        last_seen_value = "Online now"
+    elif last_seen is not None:
+        last_seen_value = last_seen.strftime("%Y-%m-%d %H:%M")
+    else:
+        last_seen_value = "Never"
+    embed.add_field(name="Last seen", value=last_seen_value, inline=True)
+
+    return embed
+
+
+def get_top_players_embed(
+    *,
+    players: list[tuple[str, int]],
+    peak: tuple[dt.date, int] | None,
+    days: int,
+):
+    embed = generate_base_embed()
+    embed.title = f"Top players in the last {days} days"
+    embed.description = (
+        "\n".join(
+            f"{rank}. {player}: {format_duration(seconds)}"
+            for rank, (player, seconds) in enumerate(players, start=1)
+        )
+        or "Nobody has played yet."
+    )
+    if peak is not None:
+        day, count = peak
+        embed.add_field(
+            name="Peak concurrency",
+            value=f"{count} players on {day.strftime('%Y-%m-%d')}",
+            inline=False,
+        )
+
+    return embed
+
+
+def get_perf_embed(profiler: LoopProfiler):
+    embed = generate_base_embed()
+    embed.title = "Event loop"
+    lags = list(profiler.lags)
+    if lags:
+        embed.description = (
+            "⏱️ Lag in the last minute: "
+            f"max {max(lags) * 1000:.0f} ms, "
+            f"mean {sum(lags) / len(lags) * 1000:.1f} ms"
+        )
+    incidents = profiler.incidents
+    if not incidents:
+        embed.add_field(
+            name="Incidents",
+            value=f"No stalls longer than {profiler.threshold * 1000:.0f} ms.",
+            inline=False,
+        )
+    for incident in incidents[:10]:
+        value = f"`{shorten(incident.callback or 'unknown', MAX_FRAME_LENGTH)}`"
+        if incident.stack:
+            value += f"\n`{shorten(incident.stack[-1], MAX_FRAME_LENGTH)}`"
+        if hot_stacks := incident.hot_stacks(1):
+            stack, hits = hot_stacks[0]
+            value += f"\nHot: `{shorten(stack[-1], MAX_FRAME_LENGTH)}` ({hits} samples)"
+        name = (
+            f"{incident.kind} {incident.duration * 1000:.0f} ms at "
+            f"{incident.timestamp.strftime('%H:%M:%S')}"
+        )
+        # The remaining incidents are still in the attached dump
+        if len(embed) + len(name) + len(value) > MAX_EMBED_LENGTH:
+            break
+        embed.add_field(name=name, value=value, inline=False)
+
+    return embed
+
+
+def get_whitelist_embed(players: list[str]):
+    embed = generate_base_embed()
+    embed.title = f"Whitelist ({len(players)} players)"
+    embed.description = "\n".join(f"- {player}" for player in players[:100])
+    if len(players) > 100:
+        embed.description += f"\n... and {len(players) - 100} more"
+
+    return embed
+
+
+def display_log_match(match: LogMatch) -> str:
+    if match.timestamp is not None:
+        return f"{match.timestamp.strftime('%Y-%m-%d')} {match.line}"
+    return f"{match.file}: {match.line}"
+
+
+def get_log_search_embeds(
+    result: LogSearchResult,
+    *,
+    lines_per_page: int = 15,
+    page_size: int = 3800,
+) -> list[discord.Embed]:
+    pages: list[list[str]] = [[]]
+    size = 0
+    for match in result.matches:
+        line = display_log_match(match)
+        if pages[-1] and (
+            len(pages[-1]) >= lines_per_page or size + len(line) + 1 > page_size
+        ):
+            pages.append([])
+            size = 0
+        pages[-1].append(line)
+        size += len(line) + 1
+
+    summary = (
+        f"{len(result.matches)}{'+' if result.truncated else ''} matches "
+        f"in {result.files_searched} files, "
+        f"{result.files_skipped} files outside the time range skipped "
+        f"({result.duration:.2f} s)"
+    )
+    embeds = []
+    for lines in pages:
+        embed = generate_base_embed()
+        embed.title = f"Log search: {result.pattern}"[:256]
+        embed.description = format_code_block(lines) if lines else "No matches."
+        embed.add_field(name="Searched", value=summary, inline=False)
+        embeds.append(embed)
+
+    return embeds
@@ -0,0 +1,146 @@
+import asyncio
+import itertools
+import logging
+from collections import defaultdict
+
+import discord
+
+from .messages import get_partial_message_from_record
+from .models import BotMessage
+
+logger = logging.getLogger(__name__)
+
+BucketType = list[BotMessage]
+
+
+def get_shard_id(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % shard_count
+
+
+class MessageFanOut:
+    def __init__(
+        self,
+        *,
+        client: discord.Client,
+        concurrency: int = 4,
+        priority_guild_ids: list[int] | None = None,
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.priority_guild_ids: set[int] = set(priority_guild_ids or [])
+        self.generation: int = 0
+        self.sent: int = 0
+        self.failed: int = 0
+        self.superseded: int = 0
+        self._pending: dict[int, BotMessage] = {}
+        self._busy_channels: set[int] = set()
+        self._fields: dict = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def plan(self, records: list[BotMessage]) -> tuple[list[BucketType], ...]:
+        shard_count = self.client.shard_count or 1
+        buckets: dict[tuple[int, int], BucketType] = defaultdict(list)
+        for record in records:
+            shard_id = get_shard_id(record.guild_id, shard_count)
+            buckets[shard_id, record.channel_id].append(record)
+
+        priority, shards = [], defaultdict(list)
+        for (shard_id, _), bucket in buckets.items():
+            if any(record.guild_id in self.priority_guild_ids for record in bucket):
+                priority.append(bucket)
+            else:
+                shards[shard_id].append(bucket)
+        # Interleaves shards, so that one shard with many guilds does not
+        # delay every other shard
+        rest = [
+            bucket
+            for buckets in itertools.zip_longest(*shards.values())
+            for bucket in buckets
+            if bucket is not None
+        ]
+        return priority, rest
+
+    def publish(self, records: list[BotMessage], **fields) -> asyncio.Task:
+        self.generation += 1
+        self._fields = fields
+        priority, rest = self.plan(records)
+        planned = [record for bucket in priority + rest for record in bucket]
+        by_message_id = {record.message_id: record for record in planned}
+        # Messages that were not edited in the previous pass keep their place
+        # ahead of the rest, so frequent updates do not keep starting again
+        # from the first guilds
+        order = [
+            record for record in planned if record.guild_id in self.priority_guild_ids
+        ]
+        order += [
+            by_message_id[message_id]
+            for message_id in self._pending
+            if message_id in by_message_id
+        ]
+        order += planned
+        self._pending = {}
+        for record in order:
+            self._pending.setdefault(record.message_id, record)
+
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+
+    def _next_bucket(self) -> BucketType:
+        # Messages in the same channel share a rate limit bucket, so they are
+        # edited one after another by the same worker
+        channel_id = next(
+            (
+                record.channel_id
+                for record in self._pending.values()
+                if record.channel_id not in self._busy_channels
+            ),
+            None,
+        )
+        if channel_id is None:
+            return []
+        bucket = [
+            record
+            for record in self._pending.values()
+            if record.channel_id == channel_id
+        ]
+        for record in bucket:
+            del self._pending[record.message_id]
+        return bucket
+
+    async def _worker(self) -> None:
+        while bucket := self._next_bucket():
+            channel_id = bucket[0].channel_id
+            self._busy_channels.add(channel_id)
+            try:
+                for record in bucket:
+                    await self._edit(record)
+            finally:
+                self._busy_channels.discard(channel_id)
+
+    async def _edit(self, record: BotMessage) -> None:
+        message = get_partial_message_from_record(record=record, client=self.client)
+        if message is None:
+            return
+        generation = self.generation
+        try:
+            await message.edit(**self._fields)
+        except discord.NotFound:
+            self.failed += 1
+        except discord.HTTPException:
+            self.failed += 1
+            logger.exception("Failed to edit message %d", record.message_id)
+        else:
+            self.sent += 1
+        if generation != self.generation:
+            # The message was queued again with the newer content when it was
+            # published
+            self.superseded += 1
@@ -0,0 +1,171 @@
+import mmap
+import struct
+import zlib
+from pathlib import Path
+
+END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2IH")
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct("<4sIQI")
+ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct("<4sQ2H2I4Q")
+CENTRAL_DIRECTORY_HEADER = struct.Struct("<4s6H3I5H2I")
+LOCAL_FILE_HEADER = struct.Struct("<4s5H3I2H")
+MAX_COMMENT_SIZE = 0xFFFF
+
+STORED = 0
+DEFLATED = 8
+
+
+class JarError(Exception):
+    pass
+
+
+class JarEntry:
+    def __init__(
+        self,
+        *,
+        name: str,
+        method: int,
+        compressed_size: int,
+        size: int,
+        header_offset: int,
+    ):
+        self.name = name
+        self.method = method
+        self.compressed_size = compressed_size
+        self.size = size
+        self.header_offset = header_offset
+
+
+class JarReader:
+    def __init__(self, buffer: bytes | mmap.mmap):
+        self.buffer = buffer
+        self._prefix: int = 0
+        self._directory_start, self._directory_end = self._find_central_directory()
+
+    @classmethod
+    def open(cls, path: Path | str) -> "JarReader":
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> "JarReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_entry(self, name: str) -> JarEntry | None:
+        encoded = name.encode()
+        for entry in self._search(encoded):
+            if entry.name == name:
+                return entry
+        return None
+
+    def get_entries(self, prefix: str, suffix: str = "") -> list[JarEntry]:
+        return [
+            entry
+            for entry in self._search(prefix.encode())
+            if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+        ]
+
+    def read(self, name: str | JarEntry) -> bytes | None:
+        entry = name if isinstance(name, JarEntry) else self.get_entry(name)
+        if entry is None:
+            return None
+        header_offset = entry.header_offset + self._prefix
+        header = LOCAL_FILE_HEADER.unpack_from(self.buffer, header_offset)
+        if header[0] != b"PK\x03\x04":
+            raise JarError(f"Bad local file header for '{entry.name}'")
+        start = header_offset + LOCAL_FILE_HEADER.size + header[9] + header[10]
+        data = self.buffer[start : start + entry.compressed_size]
+        if entry.method == STORED:
+            return data
+        if entry.method == DEFLATED:
+            return zlib.decompress(
+                data, -zlib.MAX_WBITS, entry.size or zlib.DEF_BUF_SIZE
+            )
+        raise JarError(f"Unsupported compression method {entry.method}")
+
+    def _search(self, name: bytes):
+        # Central directory headers are immediately followed by the entry name, so
+        # searching for the name's bytes finds candidate headers without walking
+        # every entry in the directory.
+        position = self.buffer.find(name, self._directory_start, self._directory_end)
+        while position != -1:
+            header_offset = position - CENTRAL_DIRECTORY_HEADER.size
+            if (
+                header_offset >= self._directory_start
+                and self.buffer[header_offset : header_offset + 4] == b"PK\x01\x02"
+            ):
+                yield self._read_central_directory_header(header_offset)
+            position = self.buffer.find(name, position + 1, self._directory_end)
+
+    def _read_central_directory_header(self, offset: int) -> JarEntry:
+        header = CENTRAL_DIRECTORY_HEADER.unpack_from(self.buffer, offset)
+        name_length, extra_length = header[10], header[11]
+        name_start = offset + CENTRAL_DIRECTORY_HEADER.size
+        name = bytes(self.buffer[name_start : name_start + name_length])
+        compressed_size, size, header_offset = header[8], header[9], header[16]
+        if 0xFFFFFFFF in (compressed_size, size, header_offset):
+            compressed_size, size, header_offset = self._read_zip64_extra(
+                name_start + name_length,
+                extra_length,
+                [compressed_size, size, header_offset],
+            )
+        return JarEntry(
+            name=name.decode("utf-8", errors="replace"),
+            method=header[4],
+            compressed_size=compressed_size,
+            size=size,
+            header_offset=header_offset,
+        )
+
+    def _read_zip64_extra(
+        self, offset: int, length: int, values: list[int]
+    ) -> list[int]:
+        end = offset + length
+        while offset + 4 <= end:
+            tag, size = struct.unpack_from("<2H", self.buffer, offset)
+            if tag == 0x0001:
+                field = offset + 4
+                # Size, compressed size and offset appear in this order, only if
+                # the corresponding central directory field is saturated.
+                for index in [1, 0, 2]:
+                    if values[index] == 0xFFFFFFFF:
+                        (values[index],) = struct.unpack_from("<Q", self.buffer, field)
+                        field += 8
+                break
+            offset += 4 + size
+        return values
+
+    def _find_central_directory(self) -> tuple[int, int]:
+        length = len(self.buffer)
+        search_start = max(0, length - END_OF_CENTRAL_DIRECTORY.size - MAX_COMMENT_SIZE)
+        offset = self.buffer.rfind(b"PK\x05\x06", search_start)
+        if offset == -1:
+            raise JarError("End of central directory not found")
+        eocd = END_OF_CENTRAL_DIRECTORY.unpack_from(self.buffer, offset)
+        directory_size, directory_offset = eocd[5], eocd[6]
+
+        locator_offset = offset - ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.size
+        if (
+            locator_offset >= 0
+            and self.buffer[locator_offset : locator_offset + 4] == b"PK\x06\x07"
+        ):
+            locator = ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.unpack_from(
+                self.buffer, locator_offset
+            )
+            zip64_eocd = ZIP64_END_OF_CENTRAL_DIRECTORY.unpack_from(
+                self.buffer, locator[2]
+            )
+            directory_size, directory_offset = zip64_eocd[7], zip64_eocd[8]
+        else:
+            # Data prepended to the archive shifts every offset by the same amount
+            self._prefix = offset - directory_size - directory_offset
+            if self._prefix < 0:
+                raise JarError("Bad central directory offset")
+
+        start = directory_offset + self._prefix
+        return start, start + directory_size
@@ -0,0 +1,123 @@
+import asyncio
+import datetime as dt
+import logging
+from functools import partial
+
+from .models import ScheduledJob
+from .scheduler import CronExpression, Scheduler
+from .server import ServerConsole, ServerManager, ServerState
+
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = "job:"
+
+
+def display_duration(seconds: int) -> str:
+    if seconds >= 60 and seconds % 60 == 0:
+        minutes = seconds // 60
+        return f"{minutes} minute{'s' if minutes != 1 else ''}"
+    return f"{seconds} second{'s' if seconds != 1 else ''}"
+
+
+class ScheduledJobManager:
+    ACTIONS = ["restart", "save", "broadcast", "command"]
+    ACTIONS_WITH_ARGUMENT = ["broadcast", "command"]
+    RESTART_WARNINGS = [300, 60, 30, 10, 5, 4, 3, 2, 1]
+
+    def __init__(
+        self,
+        *,
+        scheduler: Scheduler,
+        server_state: ServerState,
+        server_console: ServerConsole,
+        server_manager: ServerManager,
+    ):
+        self.scheduler = scheduler
+        self.server_state = server_state
+        self.server_console = server_console
+        self.server_manager = server_manager
+
+    @classmethod
+    async def create(
+        cls,
+        *,
+        scheduler: Scheduler,
+        server_state: ServerState,
+        server_console: ServerConsole,
+        server_manager: ServerManager,
+    ) -> "ScheduledJobManager":
+        self = cls(
+            scheduler=scheduler,
+            server_state=server_state,
+            server_console=server_console,
+            server_manager=server_manager,
+        )
+        for record in await ScheduledJob.all():
+            try:
+                self._schedule(record)
+            except ValueError:
+                logger.exception("Could not schedule job '%s'", record.name)
+        return self
+
+    async def add_job(
+        self,
+        *,
+        name: str,
+        cron: str,
+        action: str,
+        argument: str | None = None,
+    ) -> ScheduledJob:
+        # Raises for expressions that parse but never match, like 0 0 30 2 *
+        CronExpression(cron).next_after(dt.datetime.now())
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown action: '{action}'")
+        if action in self.ACTIONS_WITH_ARGUMENT and not argument:
+            raise ValueError(f"Action '{action}' requires an argument")
+
+        record, _ = await ScheduledJob.update_or_create(
+            name=name,
+            defaults={"cron": cron, "action": action, "argument": argument},
+        )
+        self._schedule(record)
+        return record
+
+    async def remove_job(self, name: str) -> bool:
+        deleted = await ScheduledJob.filter(name=name).delete()
+        self.scheduler.remove(f"{JOB_PREFIX}{name}")
+        return bool(deleted)
+
+    async def list_jobs(self) -> list[ScheduledJob]:
+        return await ScheduledJob.all().order_by("name")
+
+    def _schedule(self, record: ScheduledJob) -> None:
+        action, argument = record.action, record.argument
+        lead = 0
+        if action == "restart":
+            lead = self.RESTART_WARNINGS[0]
+            callback = self._restart
+        elif action == "save":
+            callback = self._save
+        elif action == "broadcast":
+            callback = partial(self.server_console.send_command, f"say {argument}")
+        else:
+            callback = partial(self.server_console.send_command, argument)
+        self.scheduler.add_cron(
+            f"{JOB_PREFIX}{record.name}",
+            CronExpression(record.cron),
+            callback,
+            lead=lead,
+        )
+
+    async def _save(self) -> None:
+        await self.server_console.send_command("save-all")
+
+    async def _restart(self) -> None:
+        if not await self.server_state.online():
+            return
+        warnings = self.RESTART_WARNINGS
+        for warning, next_warning in zip(warnings, warnings[1:] + [0]):
+            await self.server_console.send_command(
+                f"say Server restarting in {display_duration(warning)}"
+            )
+            await asyncio.sleep(warning - next_warning)
+        await self.server_manager.restart_server()
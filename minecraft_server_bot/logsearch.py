@@ -0,0 +1,213 @@
+import asyncio
+import datetime as dt
+import gzip
+import multiprocessing
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ARCHIVE_NAME_REGEX = re.compile(r"^(?P<day>\d{4}-\d{2}-\d{2})-(?P<index>\d+)\.log\.gz$")
+LINE_TIME_REGEX = re.compile(r"^\[(?:\d{2}\w{3}\d{4} )?(?P<time>\d{2}:\d{2}:\d{2})")
+RELATIVE_TIME_REGEX = re.compile(r"^(?P<amount>\d+)\s*(?P<unit>[mhdw])$")
+RELATIVE_TIME_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+MAX_LINE_LENGTH = 500
+
+
+def parse_time(value: str, now: dt.datetime | None = None) -> dt.datetime:
+    now = now or dt.datetime.now()
+    value = value.strip()
+    if match := RELATIVE_TIME_REGEX.match(value):
+        unit = RELATIVE_TIME_UNITS[match.group("unit")]
+        return now - dt.timedelta(**{unit: int(match.group("amount"))})
+    try:
+        time = dt.datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(
+            f"Could not understand the time '{value}', "
+            "use a date like 2024-07-20 14:30 or a duration like 2h or 3d"
+        ) from None
+    if time.tzinfo is not None:
+        # Times in the log are in the local time zone, without an offset
+        time = time.astimezone().replace(tzinfo=None)
+    return time
+
+
+class LogFile:
+    def __init__(self, *, path: Path, day: dt.date, index: int):
+        self.path = path
+        self.day = day
+        self.index = index
+
+    @classmethod
+    def from_path(cls, path: Path) -> "LogFile | None":
+        if path.name == "latest.log":
+            day = dt.date.fromtimestamp(path.stat().st_mtime)
+            return cls(path=path, day=day, index=0)
+        if match := ARCHIVE_NAME_REGEX.match(path.name):
+            return cls(
+                path=path,
+                day=dt.date.fromisoformat(match.group("day")),
+                index=int(match.group("index")),
+            )
+        return None
+
+
+class LogMatch:
+    def __init__(self, *, timestamp: dt.datetime | None, line: str, file: str):
+        self.timestamp = timestamp
+        self.line = line
+        self.file = file
+
+
+class LogSearchResult:
+    def __init__(
+        self,
+        *,
+        pattern: str,
+        matches: list[LogMatch],
+        files_searched: int,
+        files_skipped: int,
+        truncated: bool,
+        duration: float,
+    ):
+        self.pattern = pattern
+        self.matches = matches
+        self.files_searched = files_searched
+        self.files_skipped = files_skipped
+        self.truncated = truncated
+        self.duration = duration
+
+
+def search_log_file(
+    path: str,
+    day: dt.date,
+    pattern: str,
+    since: dt.datetime | None,
+    until: dt.datetime | None,
+    limit: int,
+) -> tuple[list[tuple[dt.datetime | None, str]], bool]:
+    regex = re.compile(pattern)
+    # Only the newest matches in the file are kept
+    matches = deque(maxlen=limit)
+    count = 0
+    opener = gzip.open if path.endswith(".gz") else open
+    # Lines are read one at a time, so memory use does not depend on the size
+    # of the file
+    try:
+        with opener(path, "rt", encoding="utf-8", errors="replace") as file:
+            for line in file:
+                if not regex.search(line):
+                    continue
+                timestamp = None
+                if match := LINE_TIME_REGEX.match(line):
+                    time = dt.time.fromisoformat(match.group("time"))
+                    timestamp = dt.datetime.combine(day, time)
+                    if (since is not None and timestamp < since) or (
+                        until is not None and timestamp > until
+                    ):
+                        continue
+                matches.append((timestamp, line.rstrip("\n")[:MAX_LINE_LENGTH]))
+                count += 1
+    except (OSError, EOFError):
+        # Archives that are corrupt or still being written are searched up to
+        # the point that could be read
+        pass
+    return list(reversed(matches)), count > limit
+
+
+class LogSearcher:
+    def __init__(self, *, server_path: Path, max_results: int = 200):
+        self.path = server_path.joinpath("logs")
+        self.max_results = max_results
+        self._executor: ProcessPoolExecutor | None = None
+
+    def list_log_files(self) -> list[LogFile]:
+        if not self.path.is_dir():
+            return []
+        files = filter(None, (LogFile.from_path(path) for path in self.path.iterdir()))
+        return sorted(
+            files,
+            key=lambda file: (file.day, file.path.name == "latest.log", file.index),
+            reverse=True,
+        )
+
+    def select_log_files(
+        self,
+        since: dt.datetime | None,
+        until: dt.datetime | None,
+    ) -> tuple[list[LogFile], int]:
+        # The server rolls the log over at midnight, so every line in a file
+        # was written on the day in the file's name
+        files = self.list_log_files()
+        selected = [
+            file
+            for file in files
+            if (since is None or file.day >= since.date())
+            and (until is None or file.day <= until.date())
+        ]
+        return selected, len(files) - len(selected)
+
+    async def search(
+        self,
+        pattern: str,
+        *,
+        since: dt.datetime | None = None,
+        until: dt.datetime | None = None,
+    ) -> LogSearchResult:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}") from None
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        files, skipped = await asyncio.to_thread(self.select_log_files, since, until)
+
+        futures = [
+            loop.run_in_executor(
+                self._get_executor(),
+                search_log_file,
+                str(file.path),
+                file.day,
+                pattern,
+                since,
+                until,
+                self.max_results,
+            )
+            for file in files
+        ]
+        matches, searched, truncated = [], 0, False
+        try:
+            for file, future in zip(files, futures):
+                file_matches, file_truncated = await future
+                searched += 1
+                matches.extend(
+                    LogMatch(timestamp=timestamp, line=line, file=file.path.name)
+                    for timestamp, line in file_matches
+                )
+                if len(matches) >= self.max_results:
+                    truncated = (
+                        file_truncated
+                        or len(matches) > self.max_results
+                        or searched < len(files)
+                    )
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return LogSearchResult(
+            pattern=pattern,
+            matches=matches[: self.max_results],
+            files_searched=searched,
+            files_skipped=skipped,
+            truncated=truncated,
+            duration=loop.time() - start,
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
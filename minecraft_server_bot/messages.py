@@ -3,21 +3,18 @@ import discord
 from .models import BotMessage
 
 
-async def fetch_message_from_record(
+def get_partial_message_from_record(
     *,
     record: BotMessage,
     client: discord.Client,
-) -> discord.Message | None:
+) -> discord.PartialMessage | None:
     guild = client.get_guild(record.guild_id)
     if guild is None:
         return None
     channel = guild.get_channel_or_thread(record.channel_id)
     if channel is None:
         return None
-    try:
-        return await channel.fetch_message(record.message_id)
-    except discord.NotFound:
-        return None
+    return channel.get_partial_message(record.message_id)
 
 
 async def delete_existing_guild_message(
@@ -1,3 +1,13 @@
 from .bot_message import BotMessage
+from .player_session import DailyPeak, DailyPlaytime, PlayerSession
+from .scheduled_job import ScheduledJob
+from .server_start import ServerStart
 
-__all__ = ["BotMessage"]
+__all__ = [
+    "BotMessage",
+    "DailyPeak",
+    "DailyPlaytime",
+    "PlayerSession",
+    "ScheduledJob",
+    "ServerStart",
+]
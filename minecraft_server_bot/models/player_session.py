@@ -0,0 +1,29 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class PlayerSession(Model):
+    player_name = fields.CharField(32, index=True)
+    joined_at = fields.DatetimeField(index=True)
+    left_at = fields.DatetimeField()
+
+    class Meta:
+        table = "player_sessions"
+
+
+class DailyPlaytime(Model):
+    day = fields.DateField()
+    player_name = fields.CharField(32, index=True)
+    seconds = fields.IntField(default=0)
+
+    class Meta:
+        table = "daily_playtime"
+        unique_together = (("day", "player_name"),)
+
+
+class DailyPeak(Model):
+    day = fields.DateField(unique=True)
+    peak = fields.IntField(default=0)
+
+    class Meta:
+        table = "daily_peaks"
@@ -0,0 +1,13 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class ScheduledJob(Model):
+    name = fields.CharField(100, unique=True)
+    cron = fields.CharField(255)
+    action = fields.CharField(32)
+    argument = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "scheduled_jobs"
@@ -0,0 +1,15 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class ServerStart(Model):
+    started_at = fields.DatetimeField(index=True)
+    online_seconds = fields.FloatField(null=True)
+    done_seconds = fields.FloatField(null=True)
+    reported_seconds = fields.FloatField(null=True)
+    mods_fingerprint = fields.CharField(64)
+    mod_count = fields.IntField(default=0)
+    world_size = fields.BigIntField(default=0)
+
+    class Meta:
+        table = "server_starts"
@@ -1,14 +1,18 @@
 import itertools
 import json
 import re
-import zipfile
 from pathlib import Path
 from typing import TypeVar
 
 import toml
 
+from .jar import JarError, JarReader
+
 ModType = TypeVar("ModType", bound="Mod")
 
+NESTED_JAR_DIRECTORIES = ["META-INF/jars/", "META-INF/jarjar/"]
+MAX_NESTING_DEPTH = 3
+
 
 class Mod:
     def __init__(self, *, name: str, version: str, loader: str):
@@ -18,81 +22,136 @@ class Mod:
 
     @classmethod
     def from_jar(cls, path: Path | str) -> list[ModType]:
-        with zipfile.ZipFile(path) as file:
-            members = file.namelist()
-            if "fabric.mod.json" in members:
-                return FabricMod.from_jar(file)
-            elif "META-INF/mods.toml" in members:
-                return ForgeMod.from_jar(file)
+        try:
+            with JarReader.open(path) as reader:
+                return cls.from_reader(reader)
+        except (OSError, ValueError, KeyError, TypeError, JarError):
+            return []
+
+    @classmethod
+    def from_reader(cls, reader: JarReader, *, depth: int = 0) -> list[ModType]:
+        mods = []
+        for mod_class in [QuiltMod, FabricMod, NeoForgeMod, ForgeMod]:
+            if (entry := reader.get_entry(mod_class.METADATA_PATH)) is not None:
+                mods = mod_class.from_metadata(reader, reader.read(entry))
+                break
+
+        if depth < MAX_NESTING_DEPTH:
+            for directory in NESTED_JAR_DIRECTORIES:
+                for entry in reader.get_entries(directory, ".jar"):
+                    try:
+                        nested_reader = JarReader(reader.read(entry))
+                        mods.extend(cls.from_reader(nested_reader, depth=depth + 1))
+                    except (ValueError, KeyError, TypeError, JarError):
+                        continue
+
+        return mods
 
     @classmethod
     def from_jars(cls, paths: list[Path | str]) -> list[ModType]:
-        mods = list(itertools.chain.from_iterable(Mod.from_jar(path) for path in paths))
-        mods = sorted(mods, key=lambda mod: mod.name)
+        mods = itertools.chain.from_iterable(Mod.from_jar(path) for path in paths)
+        # Libraries nested in several mods are only listed once
+        unique = {(mod.loader, mod.name, mod.version): mod for mod in mods}
+        mods = sorted(unique.values(), key=lambda mod: mod.name)
 
         return mods
 
+    @staticmethod
+    def _decode(data: bytes) -> str | None:
+        for encoding in ["utf-8", "cp1252"]:
+            try:
+                return data.decode(encoding)
+            except ValueError:
+                continue
+
+    @classmethod
+    def _load_json(cls, metadata: bytes) -> dict | None:
+        if (contents := cls._decode(metadata)) is None:
+            return None
+        data = json.loads(contents, strict=False)
+        return data if isinstance(data, dict) else None
+
 
 class FabricMod(Mod):
+    METADATA_PATH = "fabric.mod.json"
+    LOADER = "fabric"
+
+    @classmethod
+    def from_metadata(cls, reader: JarReader, metadata: bytes) -> list["FabricMod"]:
+        data = cls._load_json(metadata)
+        if data is None:
+            return []
+        mod = cls(
+            name=data.get("name", data["id"]),
+            version=data["version"],
+            loader=cls.LOADER,
+        )
+        return [mod]
+
+
+class QuiltMod(Mod):
+    METADATA_PATH = "quilt.mod.json"
+    LOADER = "quilt"
+
     @classmethod
-    def from_jar(cls, zipfile: zipfile.ZipFile) -> list["FabricMod"]:
-        data = json.load(zipfile.open("fabric.mod.json"))
-        mod = cls(name=data["name"], version=data["version"], loader="fabric")
-        if mod:
-            return [mod]
-        return []
+    def from_metadata(cls, reader: JarReader, metadata: bytes) -> list["QuiltMod"]:
+        data = cls._load_json(metadata)
+        if data is None or not isinstance(data := data.get("quilt_loader"), dict):
+            return []
+        details = data.get("metadata")
+        if not isinstance(details, dict):
+            details = {}
+        mod = cls(
+            name=details.get("name", data["id"]),
+            version=data["version"],
+            loader=cls.LOADER,
+        )
+        return [mod]
 
 
 class ForgeMod(Mod):
+    METADATA_PATH = "META-INF/mods.toml"
+    LOADER = "forge"
     IMPLEMENTATION_VERSION_REGEX = re.compile(
         r"Implementation-Version: (?P<version>.*)"
     )
 
     @classmethod
-    def from_jar(cls, zipfile: zipfile.ZipFile) -> list["ForgeMod"]:
-        data = cls._read_mods_toml(zipfile)
-        if data is None:
+    def from_metadata(cls, reader: JarReader, metadata: bytes) -> list["ForgeMod"]:
+        contents = cls._decode(metadata)
+        if contents is None:
             return []
+        data = toml.loads(contents)
 
         mods = []
         file_jar_version = None
-        for mod_data in data["mods"]:
-            version = mod_data["version"]
+        for mod_data in data.get("mods", []):
+            if not isinstance(mod_data, dict):
+                continue
+            version = mod_data.get("version", "")
             if version == "${file.jarVersion}":
                 if not file_jar_version:
-                    file_jar_version = cls._read_implementation_version(zipfile)
+                    file_jar_version = cls._read_implementation_version(reader)
                 version = file_jar_version
 
             mod = cls(
-                name=mod_data["displayName"],
+                name=mod_data.get("displayName", mod_data["modId"]),
                 version=version,
-                loader="forge",
+                loader=cls.LOADER,
             )
             mods.append(mod)
 
         return mods
 
-    @staticmethod
-    def _read_mods_toml(zipfile: zipfile.ZipFile) -> dict:
-        for encoding in ["utf-8", "cp1252"]:
-            try:
-                file_contents = (
-                    zipfile.open("META-INF/mods.toml").read().decode(encoding)
-                )
-            except ValueError:
-                continue
-            else:
-                return toml.loads(file_contents)
-
     @classmethod
-    def _read_implementation_version(cls, zipfile: zipfile.ZipFile) -> dict:
-        for encoding in ["utf-8", "cp1252"]:
-            try:
-                file_contents = (
-                    zipfile.open("META-INF/MANIFEST.MF").read().decode(encoding)
-                )
-            except ValueError:
-                continue
-            else:
-                if match := cls.IMPLEMENTATION_VERSION_REGEX.search(file_contents):
-                    return match.group("version")
+    def _read_implementation_version(cls, reader: JarReader) -> str | None:
+        manifest = reader.read("META-INF/MANIFEST.MF")
+        if manifest is None or (file_contents := cls._decode(manifest)) is None:
+            return None
+        if match := cls.IMPLEMENTATION_VERSION_REGEX.search(file_contents):
+            return match.group("version").strip()
+
+
+class NeoForgeMod(ForgeMod):
+    METADATA_PATH = "META-INF/neoforge.mods.toml"
+    LOADER = "neoforge"
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import re
+from pathlib import Path
+
+from .mixins import UpdateDispatcherMixin
+from .scheduler import Scheduler
+from .server import ServerConsole
+
+PLAYER_NAME_REGEX = re.compile(r"[A-Za-z0-9_]{3,16}")
+
+
+class Player:
+    def __init__(
+        self,
+        *,
+        name: str,
+        uuid: str | None,
+        whitelisted: bool,
+        op_level: int | None,
+        banned: bool,
+    ):
+        self.name = name
+        self.uuid = uuid
+        self.whitelisted = whitelisted
+        self.op_level = op_level
+        self.banned = banned
+
+    @property
+    def op(self) -> bool:
+        return self.op_level is not None
+
+
+class PlayerListFile:
+    def __init__(self, path: Path):
+        self.path = path
+        self.by_name: dict[str, dict] = {}
+        self.by_uuid: dict[str, dict] = {}
+        self._stat: tuple[int, int] | None = None
+
+    def reload(self) -> bool:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._stat is None and not self.by_name:
+                return False
+            self._stat = None
+            self._index([])
+            return True
+        if (stat.st_mtime_ns, stat.st_size) == self._stat:
+            return False
+
+        try:
+            with open(self.path, "rb") as file:
+                entries = json.load(file)
+        except ValueError:
+            # The server may be part way through writing the file, so the
+            # current index is kept and the file is read again next time
+            return False
+        self._stat = (stat.st_mtime_ns, stat.st_size)
+        self._index(entries)
+        return True
+
+    def invalidate(self) -> None:
+        self._stat = None
+
+    def get(self, name: str) -> dict | None:
+        return self.by_name.get(name.lower())
+
+    def add(self, entry: dict) -> None:
+        self.by_name[entry["name"].lower()] = entry
+        if entry.get("uuid"):
+            self.by_uuid[entry["uuid"]] = entry
+
+    def remove(self, name: str) -> None:
+        entry = self.by_name.pop(name.lower(), None)
+        if entry is not None and entry.get("uuid"):
+            self.by_uuid.pop(entry["uuid"], None)
+
+    def _index(self, entries: list[dict]) -> None:
+        by_name, by_uuid = {}, {}
+        for entry in entries:
+            if "name" in entry:
+                by_name[entry["name"].lower()] = entry
+            if "uuid" in entry:
+                by_uuid[entry["uuid"]] = entry
+        # Replaced together, as reloading happens in a separate thread
+        self.by_name, self.by_uuid = by_name, by_uuid
+
+
+class PlayerDirectory(UpdateDispatcherMixin):
+    def __init__(self, *, server_path: Path, server_console: ServerConsole):
+        super().__init__()
+        self.server_console = server_console
+        self.usercache = PlayerListFile(server_path.joinpath("usercache.json"))
+        self.whitelist = PlayerListFile(server_path.joinpath("whitelist.json"))
+        self.ops = PlayerListFile(server_path.joinpath("ops.json"))
+        self.banned = PlayerListFile(server_path.joinpath("banned-players.json"))
+
+    @classmethod
+    async def create(
+        cls,
+        *,
+        server_path: Path,
+        server_console: ServerConsole,
+        scheduler: Scheduler,
+    ) -> "PlayerDirectory":
+        self = cls(server_path=server_path, server_console=server_console)
+        await asyncio.to_thread(self.reload)
+        scheduler.add_periodic("reload_player_lists", 5, self._reload_task)
+        return self
+
+    @property
+    def _files(self) -> list[PlayerListFile]:
+        return [self.usercache, self.whitelist, self.ops, self.banned]
+
+    def reload(self) -> bool:
+        return any([file.reload() for file in self._files])
+
+    async def _reload_task(self) -> None:
+        if await asyncio.to_thread(self.reload):
+            await self._dispatch_update()
+
+    def get_uuid(self, name: str) -> str | None:
+        for file in self._files:
+            if (entry := file.get(name)) is not None and entry.get("uuid"):
+                return entry["uuid"]
+        return None
+
+    def get_name(self, uuid: str) -> str | None:
+        for file in self._files:
+            if (entry := file.by_uuid.get(uuid)) is not None and entry.get("name"):
+                return entry["name"]
+        return None
+
+    def get_player(self, name: str) -> Player:
+        op = self.ops.get(name)
+        return Player(
+            name=name,
+            uuid=self.get_uuid(name),
+            whitelisted=self.whitelist.get(name) is not None,
+            op_level=op.get("level", 4) if op is not None else None,
+            banned=self.banned.get(name) is not None,
+        )
+
+    @property
+    def whitelisted_players(self) -> list[str]:
+        return sorted(
+            (entry["name"] for entry in self.whitelist.by_name.values()),
+            key=str.lower,
+        )
+
+    async def whitelist_add(self, name: str) -> bool:
+        return await self._apply(f"whitelist add {name}", name, self.whitelist)
+
+    async def whitelist_remove(self, name: str) -> bool:
+        self._validate(name)
+        if not await self.server_console.send_command(f"whitelist remove {name}"):
+            return False
+        self.whitelist.remove(name)
+        self.whitelist.invalidate()
+        await self._dispatch_update()
+        return True
+
+    async def op(self, name: str) -> bool:
+        return await self._apply(f"op {name}", name, self.ops, level=4)
+
+    async def _apply(
+        self,
+        command: str,
+        name: str,
+        file: PlayerListFile,
+        **fields,
+    ) -> bool:
+        self._validate(name)
+        if not await self.server_console.send_command(command):
+            return False
+        # The server writes the file shortly after the command, which replaces
+        # this entry when it is next reloaded. The file is read again even if
+        # it has not changed, in case the server rejected the command
+        file.add({"uuid": self.get_uuid(name), "name": name, **fields})
+        file.invalidate()
+        await self._dispatch_update()
+        return True
+
+    @staticmethod
+    def _validate(name: str) -> None:
+        if not PLAYER_NAME_REGEX.fullmatch(name):
+            raise ValueError(f"'{name}' is not a valid player name")
@@ -0,0 +1,248 @@
+import asyncio
+import datetime as dt
+import re
+
+from .chat import JOIN_REGEX, LEAVE_REGEX, LOG_MESSAGE_REGEX, get_server_message
+from .mixins import UpdateDispatcherMixin
+from .scheduler import CronExpression, Scheduler
+from .server import ServerConsole, ServerInfo, ServerManager
+
+CHUNKY_PROGRESS_REGEX = re.compile(
+    r"Task running for (?P<world>\S+)\. "
+    r"Processed: (?P<chunks>\d+) chunks \((?P<percent>[\d.]+)%\), "
+    r"ETA: (?P<eta>[\d:]+), Rate: (?P<rate>[\d.]+) cps"
+)
+CHUNKY_FINISHED_REGEX = re.compile(
+    r"Task finished for (?P<world>\S+)\. "
+    r"Processed: (?P<chunks>\d+) chunks \((?P<percent>[\d.]+)%\), "
+    r"Total time: (?P<total>[\d:]+)"
+)
+WORLDS = ["minecraft:overworld", "minecraft:the_nether", "minecraft:the_end"]
+PROGRESS_UPDATE_INTERVAL = 60
+JOB_PREFIX = "pregen:"
+
+
+def parse_duration(value: str) -> dt.timedelta:
+    seconds = 0
+    for part in value.split(":"):
+        seconds = seconds * 60 + int(part)
+    return dt.timedelta(seconds=seconds)
+
+
+def in_window(time: dt.time, start: dt.time, end: dt.time) -> bool:
+    if start <= end:
+        return start <= time < end
+    return time >= start or time < end
+
+
+class PregenProgress:
+    def __init__(
+        self,
+        *,
+        chunks: int,
+        percent: float,
+        rate: float | None = None,
+        eta: dt.timedelta | None = None,
+    ):
+        self.chunks = chunks
+        self.percent = percent
+        self.rate = rate
+        self.eta = eta
+        self.updated = dt.datetime.now()
+
+
+class PregenManager(UpdateDispatcherMixin):
+    def __init__(
+        self,
+        *,
+        scheduler: Scheduler,
+        server_console: ServerConsole,
+        server_info: ServerInfo,
+        server_manager: ServerManager,
+    ):
+        super().__init__()
+        self.scheduler = scheduler
+        self.server_console = server_console
+        self.server_info = server_info
+        self.server_manager = server_manager
+        self.state: str = "idle"
+        self.world: str | None = None
+        self.radius: int | None = None
+        self.center: tuple[int, int] = (0, 0)
+        self.window: tuple[dt.time, dt.time] | None = None
+        self.progress: PregenProgress | None = None
+        self.total_time: dt.timedelta | None = None
+        self._started: bool = False
+        self._players_joined: bool = False
+        self._last_progress_update: float = 0
+        self._update_task: asyncio.Task | None = None
+        self._update_lock: asyncio.Lock = asyncio.Lock()
+
+    @classmethod
+    async def create(
+        cls,
+        *,
+        scheduler: Scheduler,
+        server_console: ServerConsole,
+        server_info: ServerInfo,
+        server_manager: ServerManager,
+    ) -> "PregenManager":
+        self = cls(
+            scheduler=scheduler,
+            server_console=server_console,
+            server_info=server_info,
+            server_manager=server_manager,
+        )
+        server_info.add_listener(self.server_listener)
+        server_manager.add_listener(self.server_listener)
+        return self
+
+    @property
+    def active(self) -> bool:
+        return self.state in ["waiting", "running", "paused"]
+
+    @property
+    def can_run(self) -> bool:
+        if self.server_manager.state != "started":
+            return False
+        if self.server_info.player_count or self._players_joined:
+            return False
+        if self.window is not None:
+            return in_window(dt.datetime.now().time(), *self.window)
+        return True
+
+    async def start(
+        self,
+        *,
+        radius: int,
+        world: str = WORLDS[0],
+        center: tuple[int, int] = (0, 0),
+        window: tuple[dt.time, dt.time] | None = None,
+    ) -> bool:
+        if self.active:
+            raise ValueError("Pre-generation is already in progress")
+        if world not in WORLDS:
+            raise ValueError(f"Unknown world: '{world}'")
+        if radius <= 0:
+            raise ValueError("The radius must be positive")
+        if not await self._select(world, center, radius):
+            return False
+
+        self.world, self.radius, self.center = world, radius, center
+        self.window = window
+        self.progress, self.total_time = None, None
+        self.state, self._started = "waiting", False
+        if window is not None:
+            for name, time in zip(["start", "end"], window):
+                self.scheduler.add_cron(
+                    f"{JOB_PREFIX}{name}",
+                    CronExpression(f"{time.minute} {time.hour} * * *"),
+                    self.update,
+                )
+        await self.update()
+        return True
+
+    async def cancel(self) -> bool:
+        if not self.active:
+            return False
+        if self._started:
+            await self.server_console.send_command("chunky cancel")
+            await self.server_console.send_command("chunky confirm")
+        self._stop("idle")
+        await self._dispatch_update()
+        return True
+
+    async def update(self) -> None:
+        async with self._update_lock:
+            if not self.active:
+                return
+            state = self.state
+            if self.can_run and self.state != "running":
+                if self._started:
+                    sent = await self.server_console.send_command("chunky continue")
+                else:
+                    # Chunky only keeps the selection in memory, so it is sent
+                    # again in case the server restarted since /pregen start
+                    sent = await self._select(self.world, self.center, self.radius)
+                    if sent:
+                        sent = await self.server_console.send_command("chunky start")
+                if sent:
+                    self.state, self._started = "running", True
+            elif not self.can_run and self.state == "running":
+                if self.server_manager.state != "started":
+                    # The server does not keep the task running across restarts
+                    self.state = "paused"
+                elif await self.server_console.send_command("chunky pause"):
+                    self.state = "paused"
+            if self.state != state:
+                await self._dispatch_update()
+
+    async def server_listener(self, _) -> None:
+        if not self.server_info.player_count:
+            self._players_joined = False
+        await self.update()
+
+    def push_lines(self, lines: list[str]) -> None:
+        if not self.active:
+            return
+        changed, progressed = False, False
+        for line in lines:
+            match = LOG_MESSAGE_REGEX.match(line)
+            if match is None:
+                continue
+            message = match.group("message")
+            server_message = get_server_message(line)
+            if server_message is not None and JOIN_REGEX.match(server_message):
+                # Pauses straight away, rather than waiting for the player list
+                # to be polled
+                self._players_joined = True
+                changed = True
+            elif server_message is not None and LEAVE_REGEX.match(server_message):
+                self._players_joined = False
+                changed = True
+            elif progress := CHUNKY_PROGRESS_REGEX.search(message):
+                self.progress = PregenProgress(
+                    chunks=int(progress.group("chunks")),
+                    percent=float(progress.group("percent")),
+                    rate=float(progress.group("rate")),
+                    eta=parse_duration(progress.group("eta")),
+                )
+                progressed = True
+            elif finished := CHUNKY_FINISHED_REGEX.search(message):
+                self.progress = PregenProgress(
+                    chunks=int(finished.group("chunks")),
+                    percent=float(finished.group("percent")),
+                )
+                self.total_time = parse_duration(finished.group("total"))
+                self._stop("finished")
+                changed = True
+
+        loop = asyncio.get_running_loop()
+        if changed:
+            self._update_task = loop.create_task(
+                self.update() if self.active else self._dispatch_update()
+            )
+        elif (
+            progressed
+            and loop.time() - self._last_progress_update >= PROGRESS_UPDATE_INTERVAL
+        ):
+            # Chunky logs progress every few seconds, which would be too many
+            # edits of the controls messages
+            self._last_progress_update = loop.time()
+            self._update_task = loop.create_task(self._dispatch_update())
+
+    async def _select(self, world: str, center: tuple[int, int], radius: int) -> bool:
+        for command in [
+            f"chunky world {world}",
+            f"chunky center {center[0]} {center[1]}",
+            f"chunky radius {radius}",
+        ]:
+            if not await self.server_console.send_command(command):
+                return False
+        return True
+
+    def _stop(self, state: str) -> None:
+        self.state = state
+        self._started = False
+        for name in ["start", "end"]:
+            self.scheduler.remove(f"{JOB_PREFIX}{name}")
@@ -0,0 +1,201 @@
+import asyncio
+import datetime as dt
+import heapq
+import itertools
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from pathlib import Path
+
+
+class LoopIncident:
+    def __init__(
+        self,
+        *,
+        kind: str,
+        duration: float,
+        callback: str | None = None,
+        stack: list[str] | None = None,
+        samples: Counter | None = None,
+    ):
+        self.kind = kind
+        self.duration = duration
+        self.timestamp = dt.datetime.now()
+        self.callback = callback
+        self.stack = stack or []
+        self.samples = samples or Counter()
+
+    def hot_stacks(self, count: int = 3) -> list[tuple[list[str], int]]:
+        return [
+            (stack.split("\n"), hits) for stack, hits in self.samples.most_common(count)
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "duration": self.duration,
+            "timestamp": self.timestamp.isoformat(),
+            "callback": self.callback,
+            "stack": self.stack,
+            "hot_stacks": [
+                {"stack": stack, "samples": hits} for stack, hits in self.hot_stacks()
+            ],
+        }
+
+
+def describe_handle(handle: asyncio.Handle) -> tuple[str, list[str]]:
+    callback = handle._callback
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        name = getattr(coro, "__qualname__", repr(coro))
+        stack = [
+            f"{frame.f_code.co_filename}:{frame.f_lineno} {frame.f_code.co_name}"
+            for frame in task.get_stack()
+        ]
+        return f"Task {task.get_name()} running {name}", stack
+    return getattr(callback, "__qualname__", repr(callback)), []
+
+
+def format_frame_stack(frame, limit: int) -> str:
+    return "\n".join(
+        f"{summary.filename}:{summary.lineno} {summary.name}"
+        for summary in traceback.extract_stack(frame, limit=limit)
+    )
+
+
+class LoopProfiler:
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.1,
+        interval: float = 0.05,
+        sample_interval: float = 0.01,
+        max_incidents: int = 20,
+        max_stack_depth: int = 30,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.sample_interval = sample_interval
+        self.max_incidents = max_incidents
+        self.max_stack_depth = max_stack_depth
+        self.lags: deque[float] = deque(maxlen=int(60 / interval))
+        self._incidents: list[tuple[float, int, LoopIncident]] = []
+        self._counter = itertools.count()
+        self._original_run = None
+        self._loop_thread_id: int | None = None
+        self._current_start: float | None = None
+        self._current_samples: Counter = Counter()
+        self._slow_callback_recorded: bool = False
+        self._heartbeat_task: asyncio.Task | None = None
+        self._sampler_thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    @property
+    def incidents(self) -> list[LoopIncident]:
+        return [
+            incident
+            for _, _, incident in sorted(self._incidents, key=lambda item: -item[0])
+        ]
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._install()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._sampler_thread = threading.Thread(
+            target=self._sample, name="loop-profiler", daemon=True
+        )
+        self._sampler_thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._heartbeat_task.cancel()
+        self._heartbeat_task = None
+        self._stopped.set()
+        asyncio.events.Handle._run = self._original_run
+
+    def dump(self, path: Path) -> Path:
+        lags = list(self.lags)
+        data = {
+            "generated": dt.datetime.now().isoformat(),
+            "threshold": self.threshold,
+            "lag": {
+                "max": max(lags, default=0.0),
+                "mean": sum(lags) / len(lags) if lags else 0.0,
+            },
+            "incidents": [incident.to_dict() for incident in self.incidents],
+        }
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+        return path
+
+    def _record(self, incident: LoopIncident) -> None:
+        item = (incident.duration, next(self._counter), incident)
+        if len(self._incidents) < self.max_incidents:
+            heapq.heappush(self._incidents, item)
+        else:
+            heapq.heappushpop(self._incidents, item)
+
+    def _install(self) -> None:
+        self._original_run = original_run = asyncio.events.Handle._run
+        profiler = self
+
+        def _run(handle: asyncio.Handle) -> None:
+            if threading.get_ident() != profiler._loop_thread_id:
+                return original_run(handle)
+            start = profiler._current_start = time.perf_counter()
+            try:
+                return original_run(handle)
+            finally:
+                profiler._current_start = None
+                duration = time.perf_counter() - start
+                if duration >= profiler.threshold:
+                    profiler._record_slow_callback(handle, duration)
+
+        asyncio.events.Handle._run = _run
+
+    def _record_slow_callback(self, handle: asyncio.Handle, duration: float) -> None:
+        samples, self._current_samples = self._current_samples, Counter()
+        callback, stack = describe_handle(handle)
+        self._slow_callback_recorded = True
+        self._record(
+            LoopIncident(
+                kind="slow_callback",
+                duration=duration,
+                callback=callback,
+                stack=stack,
+                samples=samples,
+            )
+        )
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._slow_callback_recorded = False
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self.lags.append(lag)
+            if lag >= self.threshold and not self._slow_callback_recorded:
+                self._record(LoopIncident(kind="lag", duration=lag))
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.sample_interval):
+            start = self._current_start
+            if start is None or time.perf_counter() - start < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                stack = format_frame_stack(frame, self.max_stack_depth)
+                self._current_samples[stack] += 1
@@ -0,0 +1,224 @@
+import asyncio
+import datetime as dt
+import heapq
+import itertools
+import logging
+import math
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+JobCallback = Callable[[], Awaitable[None]]
+
+
+class CronExpression:
+    FIELDS = [
+        ("minute", 0, 59),
+        ("hour", 0, 23),
+        ("day", 1, 31),
+        ("month", 1, 12),
+        ("weekday", 0, 6),
+    ]
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(self.FIELDS):
+            raise ValueError(f"Expected 5 fields in cron expression: '{expression}'")
+        self.expression = expression
+        (
+            self.minutes,
+            self.hours,
+            self.days,
+            self.months,
+            self.weekdays,
+        ) = (
+            self._parse_field(part, minimum, maximum)
+            for part, (_, minimum, maximum) in zip(parts, self.FIELDS)
+        )
+        self.weekdays = {weekday % 7 for weekday in self.weekdays}
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, minimum: int, maximum: int) -> set[int]:
+        values = set()
+        for item in field.split(","):
+            range_part, _, step = item.partition("/")
+            step = int(step) if step else 1
+            if range_part == "*":
+                start, end = minimum, maximum
+            elif "-" in range_part:
+                start, end = (int(value) for value in range_part.split("-"))
+            else:
+                start = int(range_part)
+                end = maximum if step > 1 else start
+            # Allow 7 as an alias for Sunday in the weekday field
+            upper = 7 if maximum == 6 else maximum
+            if not (minimum <= start <= end <= upper) or step < 1:
+                raise ValueError(f"Invalid cron field: '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, date: dt.datetime) -> bool:
+        day_matches = date.day in self.days
+        weekday_matches = (date.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return weekday_matches
+        if self._any_weekday:
+            return day_matches
+        return day_matches or weekday_matches
+
+    def next_after(self, after: dt.datetime) -> dt.datetime:
+        current = after.replace(second=0, microsecond=0) + dt.timedelta(minutes=1)
+        limit = current + dt.timedelta(days=366 * 5)
+        while current < limit:
+            if current.month not in self.months:
+                year = current.year + current.month // 12
+                month = current.month % 12 + 1
+                current = current.replace(
+                    year=year, month=month, day=1, hour=0, minute=0
+                )
+                continue
+            if not self._day_matches(current):
+                current = (current + dt.timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if current.hour not in self.hours:
+                current = (current + dt.timedelta(hours=1)).replace(minute=0)
+                continue
+            if current.minute not in self.minutes:
+                current += dt.timedelta(minutes=1)
+                continue
+            return current
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+
+class Job:
+    def __init__(
+        self,
+        *,
+        name: str,
+        callback: JobCallback,
+        interval: float | None = None,
+        cron: CronExpression | None = None,
+        lead: float = 0,
+    ):
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.cron = cron
+        self.lead = lead
+        self.due: float = 0
+        self.next_run: dt.datetime | None = None
+        self.running: bool = False
+        self.cancelled: bool = False
+        self.runs: int = 0
+        self.skipped: int = 0
+
+    def schedule_next(self, now: float) -> None:
+        if self.interval is not None:
+            if self.due and self.due + self.interval > now:
+                self.due += self.interval
+            else:
+                self.due = (math.floor(now / self.interval) + 1) * self.interval
+        else:
+            wall_now = dt.datetime.now()
+            after = wall_now + dt.timedelta(seconds=self.lead)
+            if self.next_run is not None:
+                after = max(after, self.next_run)
+            self.next_run = self.cron.next_after(after)
+            delay = (self.next_run - wall_now).total_seconds() - self.lead
+            self.due = now + max(delay, 0)
+
+
+class Scheduler:
+    def __init__(self, *, resolution: float = 0.02):
+        self.resolution = resolution
+        self.wakeups: int = 0
+        self._jobs: dict[str, Job] = {}
+        self._heap: list[tuple[float, int, Job]] = []
+        self._counter = itertools.count()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def jobs(self) -> list[Job]:
+        return list(self._jobs.values())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def add_periodic(self, name: str, interval: float, callback: JobCallback) -> Job:
+        return self._add(Job(name=name, callback=callback, interval=interval))
+
+    def add_cron(
+        self,
+        name: str,
+        cron: CronExpression,
+        callback: JobCallback,
+        *,
+        lead: float = 0,
+    ) -> Job:
+        return self._add(Job(name=name, callback=callback, cron=cron, lead=lead))
+
+    def remove(self, name: str) -> None:
+        if (job := self._jobs.pop(name, None)) is not None:
+            job.cancelled = True
+
+    def _add(self, job: Job) -> Job:
+        # Scheduled first, so a job that can never run is not left behind
+        self._push(job, asyncio.get_running_loop().time())
+        self.remove(job.name)
+        self._jobs[job.name] = job
+        return job
+
+    def _push(self, job: Job, now: float) -> None:
+        job.schedule_next(now)
+        heapq.heappush(self._heap, (job.due, next(self._counter), job))
+        if self._heap[0][2] is job:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            if self._heap:
+                delay = self._heap[0][0] - loop.time()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                        continue
+                    except asyncio.TimeoutError:
+                        pass
+            else:
+                await self._wakeup.wait()
+                continue
+
+            self.wakeups += 1
+            now = loop.time()
+            while self._heap and self._heap[0][0] <= now + self.resolution:
+                _, _, job = heapq.heappop(self._heap)
+                if job.cancelled:
+                    continue
+                if job.running:
+                    job.skipped += 1
+                else:
+                    asyncio.create_task(self._run_job(job))
+                self._push(job, now)
+
+    async def _run_job(self, job: Job) -> None:
+        job.running = True
+        try:
+            await job.callback()
+        except Exception:
+            logger.exception("Scheduled job '%s' failed", job.name)
+        finally:
+            job.running = False
+            job.runs += 1
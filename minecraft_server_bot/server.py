@@ -1,15 +1,20 @@
 import asyncio
+import os
 import re
+from collections.abc import Callable
 from functools import wraps
 from pathlib import Path
-
-from discord.ext import tasks
+from typing import TYPE_CHECKING
 
 from .ipify import get_ip
 from .mixins import UpdateDispatcherMixin
 from .mods import Mod
+from .scheduler import Scheduler
 from .tmux import TmuxManager
 
+if TYPE_CHECKING:
+    from .startup import StartupTracker
+
 
 class ServerState(UpdateDispatcherMixin):
     def __init__(self, host: str, port: int) -> None:
@@ -106,12 +111,97 @@ class ServerConsole:
     async def list_players(self):
         self.tmux_manager.send_command("list")
 
+    @_require_online
+    async def send_command(self, command: str):
+        self.tmux_manager.send_command(command)
+
+
+LineListenerType = Callable[[list[str]], None]
+
+
+class ServerLog:
+    def __init__(self, *, server_path: Path) -> None:
+        self.path: Path = server_path.joinpath("logs", "latest.log")
+        self._position: int | None = None
+        self._inode: int | None = None
+        self._partial: str = ""
+        self._line_listeners: list[LineListenerType] = []
+        self._waiters: list[tuple[re.Pattern, asyncio.Future]] = []
+
+    @classmethod
+    async def create(cls, *, server_path: Path, scheduler: Scheduler) -> "ServerLog":
+        self = cls(server_path=server_path)
+        scheduler.add_periodic("follow_log", 0.25, self._follow_task)
+        return self
+
+    def add_line_listener(self, listener: LineListenerType) -> None:
+        self._line_listeners.append(listener)
+
+    def expect_line(self, pattern: re.Pattern) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((pattern, future))
+        return future
+
+    async def wait_for(
+        self, future: asyncio.Future, *, timeout: float
+    ) -> re.Match | None:
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiters = [
+                (pattern, waiter)
+                for pattern, waiter in self._waiters
+                if waiter is not future
+            ]
+
+    async def _follow_task(self) -> None:
+        lines = await asyncio.to_thread(self._read_new_lines)
+        if not lines:
+            return
+        for pattern, future in self._waiters:
+            if future.done():
+                continue
+            for line in lines:
+                if match := pattern.search(line):
+                    future.set_result(match)
+                    break
+        for listener in self._line_listeners:
+            listener(lines)
+
+    def _read_new_lines(self) -> list[str]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if self._position is None:
+            self._position = stat.st_size
+            self._inode = stat.st_ino
+        if stat.st_ino != self._inode or stat.st_size < self._position:
+            self._position = 0
+            self._inode = stat.st_ino
+            self._partial = ""
+        if stat.st_size == self._position:
+            return []
+
+        with open(self.path, "rb") as file:
+            file.seek(self._position)
+            data = file.read()
+        self._position += len(data)
+
+        lines = (self._partial + data.decode("utf-8", errors="replace")).split("\n")
+        self._partial = lines.pop()
+        return [line.rstrip("\r") for line in lines]
+
 
 class ServerConfiguration:
     SERVER_HOST_KEY = "server-ip"
     SERVER_PORT_KEY = "server-port"
+    LEVEL_NAME_KEY = "level-name"
     SERVER_HOST_REGEX = re.compile(rf"(?<={SERVER_HOST_KEY}=).+")
     SERVER_PORT_REGEX = re.compile(rf"(?<={SERVER_PORT_KEY}=)\d+")
+    LEVEL_NAME_REGEX = re.compile(rf"(?<={LEVEL_NAME_KEY}=).+")
 
     def __init__(self, *, server_path: Path):
         self.server_path = server_path
@@ -137,6 +227,23 @@ class ServerConfiguration:
         else:
             self.port = self.DEFAULT_PORT
 
+        match = self.LEVEL_NAME_REGEX.search(contents)
+        if match:
+            self.level_name = match.group(0).strip()
+        else:
+            self.level_name = "world"
+
+    @property
+    def world_paths(self) -> list[Path]:
+        return [
+            path
+            for path in (
+                self.server_path.joinpath(f"{self.level_name}{suffix}")
+                for suffix in ["", "_nether", "_the_end"]
+            )
+            if path.is_dir()
+        ]
+
 
 class ServerInfo(UpdateDispatcherMixin):
     PLAYER_INFO_REGEX = re.compile(
@@ -159,14 +266,14 @@ class ServerInfo(UpdateDispatcherMixin):
         server_path: Path,
         server_console: ServerConsole,
         server_state: ServerState,
+        scheduler: Scheduler,
     ) -> "ServerInfo":
         self = cls(server_path=server_path, server_console=server_console)
         if await server_state.online():
             await self.update_public_ip()
-        self._update_players_task.start()
+        scheduler.add_periodic("update_players", 5, self._update_players_task)
         return self
 
-    @tasks.loop(seconds=5)
     async def _update_players_task(self):
         if await self.update_player_info():
             await self._dispatch_update()
@@ -210,6 +317,7 @@ class ServerManager(UpdateDispatcherMixin):
         server_state: ServerState,
         server_console: ServerConsole,
         max_wait_for_online: int,
+        startup_tracker: "StartupTracker",
     ):
         super().__init__()
         self.previous_state: str | None = None
@@ -217,6 +325,7 @@ class ServerManager(UpdateDispatcherMixin):
         self.server_state: ServerState = server_state
         self.server_console: ServerConsole = server_console
         self.max_wait_for_online = max_wait_for_online
+        self.startup_tracker: "StartupTracker" = startup_tracker
         self._state_lock: asyncio.Lock = asyncio.Lock()
 
     @classmethod
@@ -225,13 +334,16 @@ class ServerManager(UpdateDispatcherMixin):
         server_state: ServerState,
         server_console: ServerConsole,
         max_wait_for_online: int,
+        startup_tracker: "StartupTracker",
+        scheduler: Scheduler,
     ) -> "ServerManager":
         self = cls(
             server_state=server_state,
             server_console=server_console,
             max_wait_for_online=max_wait_for_online,
+            startup_tracker=startup_tracker,
         )
-        self._update_state_task.start()
+        scheduler.add_periodic("update_state", 0.1, self._update_state_task)
         return self
 
     @staticmethod
@@ -248,10 +360,9 @@ class ServerManager(UpdateDispatcherMixin):
         await self._update_state("pending")
         if not await self.server_state.online():
             await self.server_console.start_command()
+            await self.startup_tracker.begin()
             await self._update_state("starting")
-        if await self.server_state.wait_for_server_start(
-            timeout=self.max_wait_for_online
-        ):
+        if await self._wait_for_server_start():
             await self._update_state("started")
         else:
             await self._update_state("stopped")
@@ -276,17 +387,24 @@ class ServerManager(UpdateDispatcherMixin):
         if await self.server_state.wait_for_server_stop():
             await self._update_state("stopped")
             await self.server_console.start_command()
+            await self.startup_tracker.begin()
             await self._update_state("starting")
-            if await self.server_state.wait_for_server_start(
-                timeout=self.max_wait_for_online
-            ):
+            if await self._wait_for_server_start():
                 await self._update_state("started")
             else:
                 await self._update_state("stopped")
         else:
             await self._update_state("started")
 
-    @tasks.loop(seconds=0.1)
+    async def _wait_for_server_start(self) -> bool:
+        online = await self.server_state.wait_for_server_start(
+            timeout=self.startup_tracker.timeout(self.max_wait_for_online)
+        )
+        while not online and self.startup_tracker.still_starting():
+            online = await self.server_state.wait_for_server_start(timeout=5)
+        await self.startup_tracker.finish(online)
+        return online
+
     @_with_state_lock
     async def _update_state_task(self) -> None:
         if await self.server_state.online():
@@ -0,0 +1,210 @@
+import asyncio
+import datetime as dt
+from collections import Counter
+
+from tortoise import transactions
+from tortoise.functions import Sum
+
+from .models import DailyPeak, DailyPlaytime, PlayerSession
+from .scheduler import Scheduler
+from .server import ServerInfo
+
+SessionType = tuple[str, dt.datetime, dt.datetime]
+
+
+def split_by_day(joined_at: dt.datetime, left_at: dt.datetime):
+    start = joined_at
+    while start < left_at:
+        midnight = dt.datetime.combine(start.date() + dt.timedelta(days=1), dt.time())
+        end = min(midnight, left_at)
+        yield start.date(), int((end - start).total_seconds())
+        start = end
+
+
+class PlayerSessionRecorder:
+    FLUSH_INTERVAL = 60
+
+    def __init__(self, *, server_info: ServerInfo):
+        self.server_info = server_info
+        self._online: dict[str, dt.datetime] = {}
+        self._completed: list[SessionType] = []
+        self._peaks: dict[dt.date, int] = {}
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+
+    @classmethod
+    async def create(
+        cls,
+        *,
+        server_info: ServerInfo,
+        scheduler: Scheduler,
+    ) -> "PlayerSessionRecorder":
+        self = cls(server_info=server_info)
+        self.record_players(server_info.players)
+        server_info.add_listener(self.server_listener)
+        scheduler.add_periodic("flush_player_sessions", cls.FLUSH_INTERVAL, self.flush)
+        return self
+
+    async def server_listener(self, _) -> None:
+        self.record_players(self.server_info.players)
+
+    def record_players(self, players: list[str]) -> None:
+        now = dt.datetime.now()
+        current = set(players)
+        for player in current - self._online.keys():
+            self._online[player] = now
+        for player in self._online.keys() - current:
+            self._completed.append((player, self._online.pop(player), now))
+        today = now.date()
+        self._peaks[today] = max(self._peaks.get(today, 0), len(current))
+
+    async def close(self) -> None:
+        # Sessions of players who are still online are ended, as the bot can not
+        # tell when they leave while it is stopped
+        self.record_players([])
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            completed, self._completed = self._completed, []
+            peaks, self._peaks = self._peaks, {}
+            if not completed and not peaks:
+                return
+            try:
+                async with transactions.in_transaction():
+                    await PlayerSession.bulk_create(
+                        [
+                            PlayerSession(
+                                player_name=player,
+                                joined_at=joined_at,
+                                left_at=left_at,
+                            )
+                            for player, joined_at, left_at in completed
+                        ]
+                    )
+                    await self._add_playtime(self._daily_playtime(completed))
+                    await self._update_peaks(peaks)
+            except Exception:
+                self._completed[:0] = completed
+                for day, peak in peaks.items():
+                    self._peaks[day] = max(self._peaks.get(day, 0), peak)
+                raise
+
+    async def get_playtime(self, player: str) -> tuple[int, dt.datetime | None]:
+        total = (
+            await DailyPlaytime.filter(player_name=player)
+            .annotate(total=Sum("seconds"))
+            .first()
+            .values_list("total", flat=True)
+        )
+        seconds = (total or 0) + self._pending_playtime(since=None)[player]
+        if player in self._online:
+            return seconds, dt.datetime.now()
+
+        last_seen = max(
+            (left_at for name, _, left_at in self._completed if name == player),
+            default=None,
+        )
+        if last_seen is None:
+            last_seen = (
+                await PlayerSession.filter(player_name=player)
+                .order_by("-joined_at")
+                .first()
+                .values_list("left_at", flat=True)
+            )
+        return seconds, last_seen
+
+    async def get_top_players(
+        self, *, days: int = 30, limit: int = 10
+    ) -> list[tuple[str, int]]:
+        since = dt.date.today() - dt.timedelta(days=days - 1)
+        pending = self._pending_playtime(since=since)
+        rows = (
+            await DailyPlaytime.filter(day__gte=since)
+            .annotate(total=Sum("seconds"))
+            .group_by("player_name")
+            .order_by("-total")
+            # Players with playtime that is not yet flushed may overtake others
+            .limit(limit + len(pending))
+            .values_list("player_name", "total")
+        )
+        totals = Counter(dict(rows))
+        totals.update(pending)
+        return totals.most_common(limit)
+
+    async def get_peak(self, *, days: int = 30) -> tuple[dt.date, int] | None:
+        since = dt.date.today() - dt.timedelta(days=days - 1)
+        record = (
+            await DailyPeak.filter(day__gte=since).order_by("-peak", "-day").first()
+        )
+        peaks = [(day, peak) for day, peak in self._peaks.items() if day >= since]
+        if record is not None:
+            peaks.append((record.day, record.peak))
+        if not peaks:
+            return None
+        return max(peaks, key=lambda item: (item[1], item[0]))
+
+    def _pending_playtime(self, *, since: dt.date | None) -> Counter:
+        now = dt.datetime.now()
+        sessions = self._completed + [
+            (player, joined_at, now) for player, joined_at in self._online.items()
+        ]
+        totals = Counter()
+        for (day, player), seconds in self._daily_playtime(sessions).items():
+            if since is None or day >= since:
+                totals[player] += seconds
+        return totals
+
+    @staticmethod
+    def _daily_playtime(sessions: list[SessionType]) -> Counter:
+        playtime = Counter()
+        for player, joined_at, left_at in sessions:
+            for day, seconds in split_by_day(joined_at, left_at):
+                playtime[(day, player)] += seconds
+        return playtime
+
+    @staticmethod
+    async def _add_playtime(playtime: Counter) -> None:
+        if not playtime:
+            return
+        existing = {
+            (record.day, record.player_name): record
+            for record in await DailyPlaytime.filter(
+                day__in={day for day, _ in playtime},
+                player_name__in={player for _, player in playtime},
+            )
+        }
+        updated = []
+        created = []
+        for (day, player), seconds in playtime.items():
+            if (record := existing.get((day, player))) is not None:
+                record.seconds += seconds
+                updated.append(record)
+            else:
+                created.append(
+                    DailyPlaytime(day=day, player_name=player, seconds=seconds)
+                )
+        if updated:
+            await DailyPlaytime.bulk_update(updated, fields=["seconds"])
+        if created:
+            await DailyPlaytime.bulk_create(created)
+
+    @staticmethod
+    async def _update_peaks(peaks: dict[dt.date, int]) -> None:
+        if not peaks:
+            return
+        existing = {
+            record.day: record for record in await DailyPeak.filter(day__in=list(peaks))
+        }
+        updated = []
+        created = []
+        for day, peak in peaks.items():
+            if (record := existing.get(day)) is not None:
+                if peak > record.peak:
+                    record.peak = peak
+                    updated.append(record)
+            else:
+                created.append(DailyPeak(day=day, peak=peak))
+        if updated:
+            await DailyPeak.bulk_update(updated, fields=["peak"])
+        if created:
+            await DailyPeak.bulk_create(created)
@@ -0,0 +1,235 @@
+import asyncio
+import datetime as dt
+import hashlib
+import os
+import re
+import statistics
+from collections import deque
+
+from .mixins import UpdateDispatcherMixin
+from .models import ServerStart
+from .scheduler import Scheduler
+from .server import ServerConfiguration, ServerLog
+from .world import WorldAnalyzer
+
+DONE_REGEX = re.compile(r"Done \((?P<seconds>[\d.]+)s\)!")
+HISTORY_SIZE = 20
+STORED_STARTS = 100
+MIN_MATCHING_STARTS = 3
+TIMEOUT_FACTOR = 1.5
+LOG_ACTIVITY_GRACE = 30
+MAX_STARTUP_TIME = 15 * 60
+PROGRESS_INTERVAL = 10
+SLOWER_THRESHOLD = 1.25
+WORLD_GROWTH_THRESHOLD = 1.1
+PROGRESS_JOB_NAME = "startup_progress"
+
+
+def get_duration(record: ServerStart) -> float | None:
+    # Starts that took longer than the timeout are only given a time once the
+    # server logs Done
+    durations = [
+        seconds
+        for seconds in [record.online_seconds, record.done_seconds]
+        if seconds is not None
+    ]
+    return max(durations) if durations else None
+
+
+class StartupTracker(UpdateDispatcherMixin):
+    def __init__(
+        self,
+        *,
+        server_configuration: ServerConfiguration,
+        world_analyzer: WorldAnalyzer,
+        scheduler: Scheduler,
+    ):
+        super().__init__()
+        self.server_configuration = server_configuration
+        self.world_analyzer = world_analyzer
+        self.scheduler = scheduler
+        self.history: deque[ServerStart] = deque(maxlen=HISTORY_SIZE)
+        self.current: ServerStart | None = None
+        self._start_time: float | None = None
+        self._last_line_time: float = 0
+        self._save_task: asyncio.Task | None = None
+
+    @classmethod
+    async def create(
+        cls,
+        *,
+        server_configuration: ServerConfiguration,
+        world_analyzer: WorldAnalyzer,
+        server_log: ServerLog,
+        scheduler: Scheduler,
+    ) -> "StartupTracker":
+        self = cls(
+            server_configuration=server_configuration,
+            world_analyzer=world_analyzer,
+            scheduler=scheduler,
+        )
+        records = await ServerStart.all().order_by("-started_at").limit(HISTORY_SIZE)
+        self.history.extend(reversed(records))
+        server_log.add_line_listener(self.push_lines)
+        return self
+
+    @property
+    def starting(self) -> bool:
+        return self._start_time is not None
+
+    @property
+    def elapsed(self) -> float | None:
+        if self._start_time is None:
+            return None
+        return asyncio.get_running_loop().time() - self._start_time
+
+    @property
+    def last_start(self) -> ServerStart | None:
+        return self.history[-1] if self.history else None
+
+    def estimate(self) -> float | None:
+        durations = self._durations(self.current or self.last_start)
+        return statistics.median(durations) if durations else None
+
+    def timeout(self, minimum: float) -> float:
+        durations = self._durations(self.current)
+        if not durations:
+            return minimum
+        return max(minimum, max(durations) * TIMEOUT_FACTOR)
+
+    def still_starting(self) -> bool:
+        # Servers with no history, or with new mods, may take longer than the
+        # timeout, so waiting continues while the server is still logging
+        if not self.starting or self.elapsed >= MAX_STARTUP_TIME:
+            return False
+        loop = asyncio.get_running_loop()
+        return loop.time() - self._last_line_time < LOG_ACTIVITY_GRACE
+
+    def changes(self, record: ServerStart | None = None) -> list[str]:
+        record = record or self.current or self.last_start
+        previous = self._previous(record)
+        if record is None or previous is None:
+            return []
+        changes = []
+        if record.mods_fingerprint != previous.mods_fingerprint:
+            difference = record.mod_count - previous.mod_count
+            if difference > 0:
+                changes.append(f"{difference} mods added")
+            elif difference < 0:
+                changes.append(f"{-difference} mods removed")
+            else:
+                changes.append("mods changed")
+        if record.world_size > previous.world_size * WORLD_GROWTH_THRESHOLD:
+            growth = record.world_size / max(previous.world_size, 1) - 1
+            changes.append(f"world grew by {growth:.0%}")
+        return changes
+
+    def slowdown(self, record: ServerStart | None = None) -> float | None:
+        record = record or self.last_start
+        if record is None or (duration := get_duration(record)) is None:
+            return None
+        earlier = [
+            get_duration(other)
+            for other in self.history
+            if other is not record and get_duration(other) is not None
+        ]
+        if not earlier:
+            return None
+        ratio = duration / statistics.median(earlier)
+        return ratio if ratio >= SLOWER_THRESHOLD else None
+
+    async def begin(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._start_time = self._last_line_time = loop.time()
+        fingerprint, mod_count, world_size = await asyncio.to_thread(self._fingerprint)
+        self.current = ServerStart(
+            started_at=dt.datetime.now(),
+            mods_fingerprint=fingerprint,
+            mod_count=mod_count,
+            world_size=world_size,
+        )
+        self.scheduler.add_periodic(
+            PROGRESS_JOB_NAME, PROGRESS_INTERVAL, self._dispatch_update
+        )
+        await self._dispatch_update()
+
+    async def finish(self, online: bool) -> None:
+        if not self.starting:
+            return
+        if online:
+            self.current.online_seconds = self.elapsed
+        self._start_time = None
+        self.scheduler.remove(PROGRESS_JOB_NAME)
+        await self.current.save()
+        self.history.append(self.current)
+        await self._prune()
+        await self._dispatch_update()
+
+    def push_lines(self, lines: list[str]) -> None:
+        if not lines or self.current is None:
+            return
+        self._last_line_time = asyncio.get_running_loop().time()
+        for line in lines:
+            if (match := DONE_REGEX.search(line)) is None:
+                continue
+            if self.current.reported_seconds is not None:
+                continue
+            self.current.reported_seconds = float(match.group("seconds"))
+            if self.starting:
+                self.current.done_seconds = self.elapsed
+            elif self.current.pk is not None:
+                # The server was reachable before it finished loading, or took
+                # longer than the timeout
+                done_seconds = (
+                    dt.datetime.now() - self.current.started_at
+                ).total_seconds()
+                if done_seconds > MAX_STARTUP_TIME:
+                    continue
+                self.current.done_seconds = done_seconds
+                self._save_task = asyncio.create_task(
+                    self.current.save(
+                        update_fields=["done_seconds", "reported_seconds"]
+                    )
+                )
+
+    def _durations(self, record: ServerStart | None) -> list[float]:
+        starts = [start for start in self.history if get_duration(start) is not None]
+        if record is not None:
+            # Starts with the same mods are a better estimate, if there are
+            # enough of them
+            matching = [
+                start
+                for start in starts
+                if start.mods_fingerprint == record.mods_fingerprint
+            ]
+            if len(matching) >= MIN_MATCHING_STARTS:
+                starts = matching
+        return [get_duration(start) for start in starts]
+
+    def _previous(self, record: ServerStart | None) -> ServerStart | None:
+        previous = None
+        for other in self.history:
+            if other is record:
+                break
+            previous = other
+        return previous
+
+    def _fingerprint(self) -> tuple[str, int, int]:
+        digest = hashlib.blake2b(digest_size=32)
+        mod_count = 0
+        mods_path = self.server_configuration.server_path.joinpath("mods")
+        if mods_path.is_dir():
+            for entry in sorted(os.scandir(mods_path), key=lambda entry: entry.name):
+                if entry.name.endswith(".jar") and entry.is_file():
+                    stat = entry.stat()
+                    digest.update(f"{entry.name}:{stat.st_size}\n".encode())
+                    mod_count += 1
+        world_size = sum(
+            stat.st_size for stat in self.world_analyzer.find_region_files().values()
+        )
+        return digest.hexdigest(), mod_count, world_size
+
+    async def _prune(self) -> None:
+        stale = await ServerStart.all().order_by("-started_at").offset(STORED_STARTS)
+        if stale:
+            await ServerStart.filter(id__in=[record.id for record in stale]).delete()
@@ -0,0 +1,145 @@
+import logging
+import re
+from collections import deque
+from collections.abc import Callable
+
+import discord
+
+from .scheduler import Scheduler
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LIMIT = 2000
+CODE_BLOCK_OVERHEAD = len("```\n\n```")
+LOG_LEVELS = ["TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL"]
+LOG_LEVEL_REGEX = re.compile(
+    r"^\[[^\]]*\] \[[^\]]*/(?P<level>[A-Z]+)\]" r"|^\[[^\]]* (?P<short_level>[A-Z]+)\]"
+)
+
+
+def format_code_block(lines: list[str]) -> str:
+    content = "\n".join(lines).replace("```", "`\u200b``")
+    return f"```\n{content}\n```"
+
+
+def format_plain(lines: list[str]) -> str:
+    return "\n".join(lines)
+
+
+class ChannelBatcher:
+    def __init__(
+        self,
+        *,
+        client: discord.Client,
+        scheduler: Scheduler,
+        name: str,
+        channel_id: int,
+        interval: float,
+        max_lines: int = 500,
+        max_messages: int = 3,
+        formatter: Callable[[list[str]], str] = format_code_block,
+        overhead: int = CODE_BLOCK_OVERHEAD,
+    ):
+        self.client = client
+        self.scheduler = scheduler
+        self.name = name
+        self.channel_id = channel_id
+        self.interval = interval
+        self.max_messages = max_messages
+        self.formatter = formatter
+        self.line_limit = MESSAGE_LIMIT - overhead
+        self.dropped: int = 0
+        self.sent: int = 0
+        self._lines: deque[str] = deque(maxlen=max_lines)
+
+    def start(self) -> None:
+        self.scheduler.add_periodic(self.name, self.interval, self._flush_task)
+
+    def stop(self) -> None:
+        self.scheduler.remove(self.name)
+
+    def push(self, lines: list[str]) -> None:
+        overflow = len(self._lines) + len(lines) - self._lines.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._lines.extend(line[: self.line_limit] for line in lines)
+
+    async def _flush_task(self) -> None:
+        if not self._lines and not self.dropped:
+            return
+        channel = self.client.get_channel(self.channel_id)
+        if channel is None:
+            return
+
+        for _ in range(self.max_messages):
+            batch, dropped = self._take_batch()
+            if not batch:
+                break
+            try:
+                await channel.send(
+                    self.formatter(batch),
+                    allowed_mentions=discord.AllowedMentions.none(),
+                )
+            except discord.HTTPException:
+                logger.exception("Failed to send lines to channel %d", self.channel_id)
+                # The lines have already been taken from the queue, so they are
+                # counted as dropped, without the summary line
+                self.dropped += dropped + len(batch) - (1 if dropped else 0)
+                break
+            self.sent += 1
+
+    def _take_batch(self) -> tuple[list[str], int]:
+        batch = []
+        size = -1
+        dropped, self.dropped = self.dropped, 0
+        if dropped:
+            summary = f"... {dropped} lines dropped"
+            batch.append(summary)
+            size += len(summary) + 1
+        while self._lines and size + len(self._lines[0]) + 1 <= self.line_limit:
+            line = self._lines.popleft()
+            batch.append(line)
+            size += len(line) + 1
+        return batch, dropped
+
+
+class ConsoleStreamer:
+    def __init__(
+        self,
+        *,
+        client: discord.Client,
+        scheduler: Scheduler,
+        channel_id: int,
+        interval: float,
+        level: str = "INFO",
+        pattern: str | None = None,
+    ):
+        self.minimum_level = LOG_LEVELS.index(level.upper())
+        self.pattern: re.Pattern | None = (
+            re.compile(pattern) if pattern is not None else None
+        )
+        self.batcher = ChannelBatcher(
+            client=client,
+            scheduler=scheduler,
+            name="stream_console",
+            channel_id=channel_id,
+            interval=interval,
+        )
+        self._include_continuation: bool = False
+
+    def start(self) -> None:
+        self.batcher.start()
+
+    def push_lines(self, lines: list[str]) -> None:
+        self.batcher.push([line for line in lines if self._include(line)])
+
+    def _include(self, line: str) -> bool:
+        match = LOG_LEVEL_REGEX.match(line)
+        if match is None:
+            return self._include_continuation
+        level = match.group("level") or match.group("short_level")
+        included = (
+            level not in LOG_LEVELS or LOG_LEVELS.index(level) >= self.minimum_level
+        ) and (self.pattern is None or self.pattern.search(line) is not None)
+        self._include_continuation = included
+        return included
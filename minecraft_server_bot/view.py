@@ -31,6 +31,9 @@ class ServerView(discord.ui.View):
             state=self.state,
             server_info=self.server_info,
             server_configuration=self.server_configuration,
+            player_directory=self.controller.player_directory,
+            pregen_manager=self.controller.pregen_manager,
+            startup_tracker=self.controller.startup_tracker,
         )
         buttons_disabled = {
             "stopped": [False, True, True],
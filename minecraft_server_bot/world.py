@@ -0,0 +1,211 @@
+import asyncio
+import datetime as dt
+import mmap
+import multiprocessing
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .server import ServerConfiguration
+
+SECTOR_SIZE = 4096
+HEADER_SIZE = 2 * SECTOR_SIZE
+CHUNKS_PER_REGION = 1024
+HEADER_STRUCT = struct.Struct(f">{2 * CHUNKS_PER_REGION}I")
+BATCH_SIZE = 256
+
+DIMENSION_PATTERNS = {
+    "region": "overworld",
+    "DIM-1/region": "the_nether",
+    "DIM1/region": "the_end",
+}
+
+
+class RegionStats:
+    def __init__(
+        self,
+        *,
+        path: Path,
+        dimension: str,
+        size: int,
+        mtime_ns: int,
+        chunk_count: int,
+        last_modified: dt.datetime | None,
+    ):
+        self.path = path
+        self.dimension = dimension
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.chunk_count = chunk_count
+        self.last_modified = last_modified
+
+
+class WorldSummary:
+    def __init__(
+        self,
+        *,
+        regions: list[RegionStats],
+        duration: float,
+        trim_age: dt.timedelta,
+    ):
+        self.regions = regions
+        self.duration = duration
+        self.trim_age = trim_age
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(region.size for region in self.regions)
+
+    @property
+    def dimensions(self) -> dict[str, tuple[int, int, int]]:
+        dimensions = {}
+        for region in self.regions:
+            regions, chunks, size = dimensions.get(region.dimension, (0, 0, 0))
+            dimensions[region.dimension] = (
+                regions + 1,
+                chunks + region.chunk_count,
+                size + region.size,
+            )
+        return dict(sorted(dimensions.items()))
+
+    def recently_modified(self, count: int = 5) -> list[RegionStats]:
+        regions = [region for region in self.regions if region.last_modified]
+        regions.sort(key=lambda region: region.last_modified, reverse=True)
+        return regions[:count]
+
+    def trim_candidates(self, count: int = 5) -> list[RegionStats]:
+        cutoff = dt.datetime.now() - self.trim_age
+        regions = [
+            region
+            for region in self.regions
+            if region.last_modified is None or region.last_modified < cutoff
+        ]
+        regions.sort(key=lambda region: region.size, reverse=True)
+        return regions[:count]
+
+
+def read_region_header(path: str) -> tuple[int, int, int, int]:
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        if stat.st_size < HEADER_SIZE:
+            return stat.st_size, stat.st_mtime_ns, 0, 0
+        with mmap.mmap(file.fileno(), HEADER_SIZE, access=mmap.ACCESS_READ) as header:
+            values = HEADER_STRUCT.unpack_from(header)
+    locations = values[:CHUNKS_PER_REGION]
+    timestamps = values[CHUNKS_PER_REGION:]
+    chunk_count = CHUNKS_PER_REGION - locations.count(0)
+    return stat.st_size, stat.st_mtime_ns, chunk_count, max(timestamps)
+
+
+def read_region_headers(paths: list[str]) -> list[tuple[int, int, int, int] | None]:
+    results = []
+    for path in paths:
+        try:
+            results.append(read_region_header(path))
+        except OSError:
+            results.append(None)
+    return results
+
+
+class WorldAnalyzer:
+    def __init__(
+        self,
+        *,
+        server_configuration: ServerConfiguration,
+        trim_age: dt.timedelta = dt.timedelta(days=30),
+    ):
+        self.server_configuration = server_configuration
+        self.trim_age = trim_age
+        self._cache: dict[tuple[Path, str], RegionStats] = {}
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def analyze(self) -> WorldSummary:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            region_files = await asyncio.to_thread(self.find_region_files)
+
+            stale = []
+            for key, stat in region_files.items():
+                cached = self._cache.get(key)
+                if (
+                    cached is None
+                    or cached.mtime_ns != stat.st_mtime_ns
+                    or cached.size != stat.st_size
+                ):
+                    stale.append(key)
+            for key in set(self._cache) - set(region_files):
+                del self._cache[key]
+
+            batches = [
+                stale[index : index + BATCH_SIZE]
+                for index in range(0, len(stale), BATCH_SIZE)
+            ]
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        self._get_executor(),
+                        read_region_headers,
+                        [str(path) for path, _ in batch],
+                    )
+                    for batch in batches
+                )
+            )
+            for batch, batch_results in zip(batches, results):
+                for (path, dimension), result in zip(batch, batch_results):
+                    if result is None:
+                        continue
+                    size, mtime_ns, chunk_count, timestamp = result
+                    self._cache[(path, dimension)] = RegionStats(
+                        path=path,
+                        dimension=dimension,
+                        size=size,
+                        mtime_ns=mtime_ns,
+                        chunk_count=chunk_count,
+                        last_modified=(
+                            dt.datetime.fromtimestamp(timestamp) if timestamp else None
+                        ),
+                    )
+
+            return WorldSummary(
+                regions=list(self._cache.values()),
+                duration=loop.time() - start,
+                trim_age=self.trim_age,
+            )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def find_region_files(self) -> dict[tuple[Path, str], os.stat_result]:
+        region_files = {}
+        for world_path in self.server_configuration.world_paths:
+            for pattern, dimension in self._region_directories(world_path):
+                for region_path in world_path.glob(pattern):
+                    for entry in os.scandir(region_path):
+                        if entry.name.endswith(".mca") and entry.is_file():
+                            key = (Path(entry.path), dimension)
+                            region_files[key] = entry.stat()
+        return region_files
+
+    @staticmethod
+    def _region_directories(world_path: Path) -> list[tuple[str, str]]:
+        directories = list(DIMENSION_PATTERNS.items())
+        dimensions_path = world_path.joinpath("dimensions")
+        if dimensions_path.is_dir():
+            for namespace in dimensions_path.iterdir():
+                for dimension in namespace.iterdir():
+                    directories.append(
+                        (
+                            dimension.joinpath("region")
+                            .relative_to(world_path)
+                            .as_posix(),
+                            f"{namespace.name}:{dimension.name}",
+                        )
+                    )
+        return directories
@@ -1,28 +1,75 @@
 import os
+from pathlib import Path
 
 import dotenv
 
 dotenv.load_dotenv()
 
-database_name = os.environ.get("DATABASE_NAME")
-if not database_name:
-    database_name = "minecraft_server_bot"
 
-TORTOISE_ORM = {
-    "connections": {
-        "default": {
+def get_connection(
+    engine: str,
+    *,
+    database_name: str = "minecraft_server_bot",
+    database_path: Path | str = "minecraft_server_bot.sqlite3",
+    pool_min_size: int = 1,
+    pool_max_size: int = 5,
+    statement_cache_size: int = 100,
+) -> dict:
+    if engine == "sqlite":
+        return {
+            "engine": "tortoise.backends.sqlite",
+            "credentials": {
+                "file_path": str(Path(database_path).expanduser()),
+                "journal_mode": "WAL",
+                "synchronous": "NORMAL",
+            },
+        }
+    if engine == "postgres":
+        return {
             "engine": "tortoise.backends.asyncpg",
             "credentials": {
-                "database": f"{database_name}",
+                "database": database_name,
+                "minsize": pool_min_size,
+                "maxsize": pool_max_size,
+                "statement_cache_size": statement_cache_size,
             },
         }
-    },
-    "apps": {
-        "models": {
-            "models": ["minecraft_server_bot.models", "aerich.models"],
-            "default_connection": "default",
+    raise Exception(f"Unknown database engine: '{engine}'")
+
+
+def get_tortoise_config(connection: dict) -> dict:
+    return {
+        "connections": {"default": connection},
+        "apps": {
+            "models": {
+                "models": ["minecraft_server_bot.models", "aerich.models"],
+                "default_connection": "default",
+            },
         },
-    },
-}
+    }
+
+
+database_engine = os.environ.get("DATABASE_ENGINE")
+if not database_engine:
+    database_engine = "postgres"
+
+database_name = os.environ.get("DATABASE_NAME")
+if not database_name:
+    database_name = "minecraft_server_bot"
+
+database_path = os.environ.get("DATABASE_PATH")
+if not database_path:
+    database_path = "minecraft_server_bot.sqlite3"
+
+TORTOISE_ORM = get_tortoise_config(
+    get_connection(
+        database_engine,
+        database_name=database_name,
+        database_path=database_path,
+        pool_min_size=int(os.environ.get("DATABASE_POOL_MIN_SIZE", 1)),
+        pool_max_size=int(os.environ.get("DATABASE_POOL_MAX_SIZE", 5)),
+        statement_cache_size=int(os.environ.get("DATABASE_STATEMENT_CACHE_SIZE", 100)),
+    )
+)
 
 __all__ = ["TORTOISE_ORM"]